@@ -1,8 +1,25 @@
 import streamlit as st
 import pandas as pd
-from io import BytesIO
-from utils.file_router import get_processor
-import traceback
+import os
+import posixpath
+import uuid
+import multiprocessing
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from utils.allocation import AllocationResult, stack
+from utils.jobs import DONE, RUNNING, JobQueue
+from utils.cache import ResultCache
+from utils.exports import ENGINES, XLSX_MIME, cached_workbook
+from utils.readers import DEFAULT_READER, READERS
+from utils.profiling import StageTimer, stage, stage_summary, stage_table, timings_json
+from utils.file_router import get_processor, name_key
+from utils.history import DEFAULT_PATH as HISTORY_PATH, HistoryStore, ingest_upload
+from utils.preview import PAGE_SIZES, as_frame, overview, page, page_count
+from utils.lookthrough import AMOUNT_COLUMN, FUND_COLUMN, PORTFOLIO_COLUMN, fund_matrix, look_through, read_holdings
+from utils.uploads import UploadStore, start_sweeper
+from utils.archives import is_archive, iter_members
+from utils.runner import format_error
 
 # =============================
 # Page / App Config
@@ -15,12 +32,81 @@ st.set_page_config(
 )
 
 # ---------- Session State ----------
-if "uploaded_bytes" not in st.session_state:
-    st.session_state.uploaded_bytes = {}
-if "results" not in st.session_state:
-    st.session_state.results = {"valid": {}, "error": {}}
+JOB_DISPATCHERS = max(os.cpu_count() or 1, 2)
+if "session_id" not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+if "uploads" not in st.session_state:
+    # Handles only: files over the session's memory budget are spilled to disk
+    st.session_state.uploads = UploadStore(st.session_state.session_id)
+if "upload_round" not in st.session_state:
+    st.session_state.upload_round = 0
 if "theme" not in st.session_state:
     st.session_state.theme = "Dark"
+if "upload_errors" not in st.session_state:
+    st.session_state.upload_errors = {}
+if "export_timings" not in st.session_state:
+    st.session_state.export_timings = {}
+if "history_notes" not in st.session_state:
+    # Ingest outcome per job key, so each upload is stored (or refused) once
+    st.session_state.history_notes = {}
+if "jobs" not in st.session_state:
+    # Lives in the session, outside the rerun cycle: jobs keep running across reruns
+    st.session_state.jobs = JobQueue(dispatchers=JOB_DISPATCHERS)
+
+# =============================
+# Shared resources (live across reruns and sessions)
+# =============================
+@st.cache_resource(show_spinner=False)
+def get_cache() -> ResultCache:
+    return ResultCache()
+
+@st.cache_resource(show_spinner=False)
+def get_history() -> HistoryStore:
+    return HistoryStore()
+
+@st.cache_resource(show_spinner=False)
+def get_sweeper():
+    # One per server: deletes the spill directories of abandoned sessions
+    return start_sweeper()
+
+@st.cache_resource(show_spinner=False)
+def get_pool(n_workers: int) -> ProcessPoolExecutor:
+    # Spawned (not forked) workers: the Streamlit server process is multi-threaded.
+    # Cached so the pool and its imported processors stay warm across reruns.
+    return ProcessPoolExecutor(max_workers=n_workers, mp_context=multiprocessing.get_context("spawn"))
+
+def timed_workbook(log: dict, label: str, sheets, engine: str = "openpyxl") -> bytes:
+    # Runs on download, outside the script run, so it records into a plain dict
+    # taken from session state rather than st.session_state itself. ``sheets``
+    # may be a callable so large exports are only assembled when clicked.
+    timer = StageTimer()
+    with timer.active(), stage("export"):
+        data = cached_workbook(sheets() if callable(sheets) else sheets, engine)
+    log[label] = timer.records
+    return data
+
+def sheet_title(fname: str) -> str:
+    # Zip members are named "<bundle>.zip/<member>"; title the sheet after the member
+    return posixpath.basename(fname).split(".")[0][:31] or "Sheet"
+
+def unique_title(title: str, taken: set) -> str:
+    # Excel compares sheet names case-insensitively and caps them at 31 characters
+    candidate, n = title, 1
+    while candidate.lower() in taken:
+        n += 1
+        suffix = f" ({n})"
+        candidate = title[:31 - len(suffix)] + suffix
+    taken.add(candidate.lower())
+    return candidate
+
+def combined_sheets(results: dict) -> dict:
+    # One dense row per fund, then each file's own sheet
+    single = {n: r for n, r in results.items() if isinstance(r, AllocationResult)}
+    sheets = {"Summary": stack(single).reset_index()} if single else {}
+    taken = {name.lower() for name in sheets}
+    for fname, result in results.items():
+        sheets[unique_title(sheet_title(fname), taken)] = as_frame(result)
+    return sheets
 
 # =============================
 # Theming (Light / Dark)
@@ -109,83 +195,174 @@ with st.sidebar:
     st.markdown("### 📌 Tips")
     st.markdown(
         "- File names decide sheet names (trimmed to 31 chars).\n"
-        "- Each processor must return a Pandas DataFrame.\n"
-        "- Use the per-file expander to preview results.\n"
+        "- Each processor returns an AllocationResult (one value per canonical tag).\n"
+        "- Pick a file under Preview & actions to page through its result.\n"
         "- Download button saves **one** Excel with all sheets.")
 
+    st.markdown("### 📚 Schemes")
+    all_schemes = st.toggle("All scheme sheets", value=False,
+                            help="Extract every scheme sheet of each workbook into one row per scheme, "
+                                 "instead of only the processor's fund sheet. Worker processes split the sheets.")
+
+    st.markdown("### 🗃️ History")
+    save_history = st.toggle("Save results to history", value=False,
+                             help="Store allocations by AMC, scheme and disclosure month in a local database. "
+                                  "Files already stored (same content) are skipped.")
+    st.caption(f"Database: `{HISTORY_PATH}`")
+
+    st.markdown("### ⚡ Performance")
+    parallel = st.toggle("Process files in parallel", value=False,
+                         help="Run processors in a pool of worker processes; results appear as each file finishes.")
+    max_workers = os.cpu_count() or 1
+    workers = st.slider("Worker processes", 1, max(max_workers, 2), min(4, max_workers), disabled=not parallel)
+    use_cache = st.toggle("Reuse cached results", value=True,
+                          help="Skip files already processed with the same content and processor version.")
+    reader = st.selectbox("Workbook reader", list(READERS), index=list(READERS).index(DEFAULT_READER),
+                          help="stream parses only the target sheet's XML and is faster on large files; "
+                               "calamine (if installed) decodes it natively and is faster still.")
+    export_engine = st.selectbox("Combined Excel writer", ENGINES, index=len(ENGINES) - 1,
+                                 help="xlsxwriter streams rows in constant memory and is faster for large exports.")
+    trace_memory = st.toggle("Trace memory per stage", value=False,
+                             help="Record the process-wide tracemalloc peak during every stage (slower; traced "
+                                  "stages of concurrent jobs run one at a time). Peak RSS is always recorded (not on Windows).")
+
     st.markdown("### 🧹 Session")
     if st.button("Reset All", type="secondary"):
-        st.session_state.uploaded_bytes = {}
-        st.session_state.results = {"valid": {}, "error": {}}
+        st.session_state.uploads.clear()
+        st.session_state.upload_errors = {}
+        st.session_state.export_timings = {}
+        st.session_state.history_notes = {}
+        # Cancel queued jobs and release the dispatcher threads; running ones finish unobserved
+        st.session_state.jobs.shutdown()
+        st.session_state.jobs = JobQueue(dispatchers=JOB_DISPATCHERS)
         st.toast("Session cleared.")
-        st.experimental_rerun()
+        st.rerun()
+    if st.button("Clear result cache", type="secondary"):
+        get_cache().clear()
+        st.toast("Result cache cleared.")
 
 # =============================
 # Upload Section
 # =============================
 st.markdown('<div class="section">', unsafe_allow_html=True)
 st.subheader("📤 Upload Excel Files")
+uploads = st.session_state.uploads
 uploaded_files = st.file_uploader(
-    "Drag & drop or browse to upload (.xlsx)",
-    type=["xlsx"],
+    "Drag & drop or browse to upload (.xlsx, or .zip bundles of them)",
+    type=["xlsx", "zip"],
     accept_multiple_files=True,
-    key="upload",
-    help="Only Excel (.xlsx) files are supported"
+    key=f"upload_{st.session_state.upload_round}",
+    help="Excel (.xlsx) files, or .zip archives whose .xlsx members are each processed like an upload"
 )
 
-# Persist file bytes across reruns so preview/actions don't lose data
+# Move new uploads into the session's store, then swap in a fresh widget so
+# Streamlit releases its own in-memory copies of the files. Zip bundles are
+# read member by member straight from the upload, never extracted.
 if uploaded_files:
     for f in uploaded_files:
         try:
-            # Streamlit uploads are file-like; read once and store
-            st.session_state.uploaded_bytes[f.name] = f.read()
-        except Exception:
-            # Some browsers forbid multiple reads; ignore
-            pass
+            if is_archive(f.name):
+                for member, data in iter_members(f):
+                    if isinstance(data, Exception):
+                        st.session_state.upload_errors[f"{f.name}/{member}"] = format_error(data)
+                    else:
+                        uploads.add(f"{f.name}/{member}", data)
+            else:
+                uploads.add(f.name, f.getvalue())
+        except Exception as e:  # not a zip, a spill that failed (disk full), an unreadable upload
+            st.session_state.upload_errors[f.name] = format_error(e)
+    st.session_state.upload_round += 1
+    st.rerun()
+
+if st.session_state.upload_errors:
+    with st.expander(f"⚠️ {len(st.session_state.upload_errors)} upload(s) could not be read", expanded=False):
+        for name, msg in st.session_state.upload_errors.items():
+            st.markdown(f"**{name}**  ")
+            st.code(msg, language="text")
+
+get_sweeper()
+uploads.touch()
+for name in uploads.prune():
+    st.warning(f"{name} expired from temporary storage; please upload it again.")
+if len(uploads):
+    st.caption(
+        f"{len(uploads)} file(s) in this session · {uploads.memory_bytes / 2**20:.1f} MB in memory · "
+        f"{uploads.disk_bytes / 2**20:.1f} MB spilled to disk"
+    )
 st.markdown('</div>', unsafe_allow_html=True)
 
 # =============================
 # Processing Section
 # =============================
-if st.session_state.uploaded_bytes:
+if len(uploads):
     st.markdown('<div class="section">', unsafe_allow_html=True)
     st.subheader("⚙️ Processing Results")
 
-    files_map = dict(st.session_state.uploaded_bytes)  # shallow copy
-
-    valid_results: dict[str, pd.DataFrame] = {}
-    error_results: dict[str, str] = {}
-
-    # Progress and live log
-    progress = st.progress(0)
-    log = st.empty()
-
-    for i, (file_name, file_bytes) in enumerate(files_map.items(), start=1):
-        try:
-            log.info(f"Processing **{file_name}** …")
-            processor = get_processor(file_name)
-            df = processor(file_bytes)
-            if not isinstance(df, pd.DataFrame):
-                raise TypeError("Processor did not return a pandas DataFrame")
-
-            # Light sanity: limit columns to <= 50 to avoid huge sheets
-            if df.shape[1] > 200:
-                raise ValueError("Unusually wide DataFrame (>200 columns). Check your processor output.")
+    files_map = dict(uploads.items())  # name -> Upload handle; bytes are read by the jobs
+
+    use_pool = parallel and workers > 1 and (len(files_map) > 1 or all_schemes)
+    executor = get_pool(workers) if use_pool else None
+    cache = get_cache() if use_cache else None
+
+    # One background job per distinct content, name routing and result-shaping
+    # settings. Reruns find the existing job; identical files uploaded under
+    # names that route alike share one job; changing the reader or scheme mode
+    # queues new ones.
+    queue = st.session_state.jobs
+    options = dict(executor=executor, cache=cache, reader=reader, trace_memory=trace_memory, schemes=all_schemes)
+    jobs = {
+        name: queue.submit(name, upload, (upload.digest, name_key(name), reader, all_schemes), **options)
+        for name, upload in files_map.items()
+    }
+    finished_at_render = sum(not job.pending for job in jobs.values())
+    shared = len(jobs) - len({job.id for job in jobs.values()})
+    if shared:
+        st.caption(f"{shared} upload(s) have the same content as another and reuse its result.")
+
+    # Polls while jobs are pending; a full rerun renders each newly finished file
+    @st.fragment(run_every=1.0 if finished_at_render < len(jobs) else None)
+    def job_progress():
+        finished = sum(not job.pending for job in jobs.values())
+        if finished > finished_at_render:
+            st.rerun()
+        if finished == len(jobs):
+            return
+        running = sum(job.status == RUNNING for job in jobs.values())
+        st.progress(finished / len(jobs),
+                    text=f"{finished}/{len(jobs)} done · {running} running · {len(jobs) - finished - running} queued"
+                         + (f" · {workers} workers" if use_pool else ""))
+        st.dataframe(
+            pd.DataFrame([
+                {"File": name, "Status": job.status, "Seconds": round(job.seconds, 2)}
+                for name, job in jobs.items() if job.pending
+            ]),
+            use_container_width=True, hide_index=True,
+        )
 
-            valid_results[file_name] = df
-        except Exception as e:
-            tb = "\n".join(traceback.format_exception_only(type(e), e)).strip()
-            error_results[file_name] = tb
-        finally:
-            progress.progress(i / max(len(files_map), 1))
+    job_progress()
 
-    progress.empty(); log.empty()
+    # Finished jobs, in upload order whatever order they completed in
+    valid_results: dict[str, AllocationResult | pd.DataFrame] = {n: j.df for n, j in jobs.items() if j.status == DONE}
+    error_results: dict[str, str] = {n: j.error for n, j in jobs.items() if not j.pending and j.status != DONE}
+    timings: dict[str, list] = {n: j.stages for n, j in jobs.items() if not j.pending}
+    pending_count = len(jobs) - len(valid_results) - len(error_results)
+    done_jobs = [j for j in jobs.values() if not j.pending]
+    batch_seconds = (
+        max(j.finished for j in done_jobs) - min(j.submitted for j in jobs.values()) if done_jobs else 0.0
+    )
 
     # Message blocks
-    c1, c2, c3 = st.columns([1, 1, 1])
+    c1, c2, c3, c4 = st.columns([1, 1, 1, 1])
     with c1: st.markdown(f"<span class='pill'>📄 Files: <b>{len(files_map)}</b></span>", unsafe_allow_html=True)
     with c2: st.markdown(f"<span class='pill'>✅ Success: <b>{len(valid_results)}</b></span>", unsafe_allow_html=True)
     with c3: st.markdown(f"<span class='pill'>❌ Errors: <b>{len(error_results)}</b></span>", unsafe_allow_html=True)
+    with c4:
+        if pending_count:
+            st.markdown(f"<span class='pill'>⏳ In progress: <b>{pending_count}</b></span>", unsafe_allow_html=True)
+        elif cache:
+            st.markdown(f"<span class='pill'>🗄️ Cache: <b>{cache.hits}</b> hits · <b>{cache.misses}</b> misses</span>", unsafe_allow_html=True)
+        else:
+            st.markdown("<span class='pill'>🗄️ Cache: off</span>", unsafe_allow_html=True)
 
     # Error panel (if any)
     if error_results:
@@ -199,63 +376,164 @@ if st.session_state.uploaded_bytes:
     if valid_results:
         st.success(f"Processed {len(valid_results)} file(s) successfully.")
 
-        # Overview table
-        overview_rows = []
-        for fname, df in valid_results.items():
-            overview_rows.append({
-                "File": fname,
-                "Rows": df.shape[0],
-                "Columns": df.shape[1],
-                "Column names": ", ".join(map(str, list(df.columns)[:6])) + (" …" if df.shape[1] > 6 else "")
-            })
-        overview = pd.DataFrame(overview_rows)
+        # Overview table: built once per result set (the jobs behind it), scrolled in the browser
+        result_set = tuple((n, jobs[n].id) for n in valid_results)
+        if st.session_state.get("overview", (None,))[0] != result_set:
+            st.session_state.overview = (result_set, overview(valid_results))
         with st.expander("📊 Quick Overview (all processed files)", expanded=False):
-            st.dataframe(overview, use_container_width=True, hide_index=True)
+            st.dataframe(st.session_state.overview[1], use_container_width=True, hide_index=True, height=400)
+
+        # One preview for the selected file, one page of rows at a time
+        with st.expander("📄 Preview & actions", expanded=False):
+            fname = st.selectbox("File", list(valid_results), key="preview_file")
+            df = as_frame(valid_results[fname])
+            sheet_name = sheet_title(fname)
+            t1, t2, t3 = st.tabs(["Preview", "Info", "Export one sheet"])
+            with t1:
+                cP, cS = st.columns([1, 1])
+                with cS: size = st.selectbox("Rows per page", PAGE_SIZES, key="preview_size")
+                pages = page_count(len(df), size)
+                with cP: number = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1,
+                                                  key=f"preview_page:{fname}:{size}")
+                rows, start, stop = page(df, number, size)
+                st.caption(f"Rows {start + 1 if stop else 0}–{stop} of {len(df)}")
+                st.dataframe(rows, use_container_width=True)
+            with t2:
+                cA, cB, cC = st.columns([1,1,1])
+                with cA: st.metric("Rows", df.shape[0])
+                with cB: st.metric("Columns", df.shape[1])
+                with cC: st.metric("Memory (KB)", f"{df.memory_usage(index=True).sum() / 1024:.1f}")
+                st.markdown("**Stage timings:**")
+                file_stages = timings.get(fname, []) + st.session_state.export_timings.get(fname, [])
+                st.dataframe(pd.DataFrame(file_stages), use_container_width=True, hide_index=True)
+                st.markdown("**Columns:**")
+                st.code("\n".join(map(str, df.columns.tolist())), language="text")
+            with t3:
+                # Built only when clicked, then memoized on the frame's content
+                st.download_button(
+                    label=f"⬇️ Download '{sheet_name}.xlsx'",
+                    data=partial(timed_workbook, st.session_state.export_timings, fname, {sheet_name: df}),
+                    file_name=f"{sheet_name}.xlsx",
+                    mime=XLSX_MIME,
+                    on_click="ignore",
+                    use_container_width=True,
+                )
+
+        # Combined Excel for all, assembled only when clicked
+        st.download_button(
+            label="📥 Download Combined Excel",
+            data=partial(timed_workbook, st.session_state.export_timings, "(combined export)",
+                         partial(combined_sheets, valid_results), export_engine),
+            file_name="MutualFund_Summary.xlsx",
+            mime=XLSX_MIME,
+            on_click="ignore",
+            use_container_width=True,
+        )
 
-        # Per-file tabs/expanders
-        for fname, df in valid_results.items():
-            sheet_name = fname.split(".")[0][:31]
-            with st.expander(f"📄 {sheet_name} — preview & actions", expanded=False):
-                t1, t2, t3 = st.tabs(["Preview", "Info", "Export one sheet"])
-                with t1:
-                    st.dataframe(df, use_container_width=True)
-                with t2:
-                    cA, cB, cC = st.columns([1,1,1])
-                    with cA: st.metric("Rows", df.shape[0])
-                    with cB: st.metric("Columns", df.shape[1])
-                    with cC: st.metric("Memory (KB)", f"{df.memory_usage(index=True).sum() / 1024:.1f}")
-                    st.markdown("**Columns:**")
-                    st.code("\n".join(map(str, df.columns.tolist())), language="text")
-                with t3:
-                    buf_one = BytesIO()
-                    # Always write a new workbook with a single sheet of this df
-                    with pd.ExcelWriter(buf_one, engine='openpyxl') as w:
-                        df.to_excel(w, sheet_name=sheet_name, index=False)
-                    one_bytes = buf_one.getvalue()
+        # Blended exposure of one portfolio typed in here, or many from a holdings file
+        with st.expander("🧮 Portfolio look-through", expanded=False):
+            funds = fund_matrix(valid_results)
+            holdings_file = st.file_uploader(
+                "Holdings (CSV or Parquet: Portfolio, Fund, Amount — or Units and NAV)",
+                type=["csv", "parquet"], key="holdings",
+            )
+            if holdings_file is None:
+                st.caption("Enter an amount per fund, or upload holdings for many portfolios at once.")
+                edited = st.data_editor(
+                    pd.DataFrame({FUND_COLUMN: funds.index, AMOUNT_COLUMN: 0.0}),
+                    disabled=[FUND_COLUMN], use_container_width=True, hide_index=True, key="holdings_editor",
+                )
+                holdings = edited[edited[AMOUNT_COLUMN] > 0].assign(**{PORTFOLIO_COLUMN: "Portfolio"})
+            else:
+                try:
+                    holdings = read_holdings(holdings_file)
+                except Exception as e:
+                    st.error(f"Could not read {holdings_file.name}: {e}")
+                    holdings = None
+            if holdings is not None and not holdings.empty:
+                try:
+                    exposure = look_through(funds, holdings)
+                except (KeyError, ValueError) as e:
+                    st.error(e.args[0] if e.args else str(e))
+                else:
+                    st.dataframe(exposure, use_container_width=True)
                     st.download_button(
-                        label=f"⬇️ Download '{sheet_name}.xlsx'",
-                        data=one_bytes,
-                        file_name=f"{sheet_name}.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                        use_container_width=True,
+                        label="⬇️ Download exposure (CSV)",
+                        data=exposure.to_csv().encode(),
+                        file_name="MutualFund_Exposure.csv",
+                        mime="text/csv",
                     )
 
-        # Combined Excel for all
-        out_all = BytesIO()
-        with pd.ExcelWriter(out_all, engine='openpyxl') as writer:
-            for fname, df in valid_results.items():
-                safe_sheet = fname.split(".")[0][:31] or "Sheet"
-                df.to_excel(writer, sheet_name=safe_sheet, index=False)
-        all_bytes = out_all.getvalue()  # safer than seek+read
-
+    # Stage timings for this run (exports are added once they have been downloaded)
+    with st.expander("⏱️ Timings (per file and stage)", expanded=False):
+        run_timings = {**timings}
+        for label, records in st.session_state.export_timings.items():
+            if label in run_timings or label == "(combined export)":
+                run_timings[label] = run_timings.get(label, []) + records
+        table = stage_table(run_timings)
+        st.caption(
+            f"Batch wall time {batch_seconds:.2f}s for {len(files_map)} file(s). "
+            "Peak RSS is the high-water mark of the process that ran the stage (a worker when parallel)."
+        )
+        st.dataframe(table, use_container_width=True, hide_index=True)
+        if not table.empty:
+            cS, cT = st.columns([1, 1])
+            with cS:
+                st.markdown("**Slowest files**")
+                st.dataframe(table.nlargest(5, "Total s")[["File", "Total s"]], use_container_width=True, hide_index=True)
+            with cT:
+                st.markdown("**Stages across the batch**")
+                st.dataframe(stage_summary(run_timings), use_container_width=True, hide_index=True)
+        meta = {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "files": len(files_map),
+            "batch_seconds": batch_seconds,
+            "reader": reader,
+            "parallel_workers": workers if use_pool else 1,
+            "cache": use_cache,
+            "trace_memory": trace_memory,
+            "all_schemes": all_schemes,
+        }
         st.download_button(
-            label="📥 Download Combined Excel",
-            data=all_bytes,
-            file_name="MutualFund_Summary.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            use_container_width=True,
+            label="⬇️ Download timings (JSON)",
+            data=partial(timings_json, meta, timings, st.session_state.export_timings),
+            file_name="MutualFund_Timings.json",
+            mime="application/json",
+            on_click="ignore",
         )
 
+    # Persist this run's allocations once per job: reruns reuse the outcome
+    # instead of re-reading (possibly spilled) uploads and routing them again
+    if save_history and valid_results:
+        history = get_history()
+        outcomes = st.session_state.history_notes
+        notes = []
+        first = {}  # job key -> the upload that shares its result
+        for fname, df in valid_results.items():
+            key = jobs[fname].key
+            if first.setdefault(key, fname) != fname:
+                notes.append({"File": fname, "Stored": False,
+                              "Note": f"same content as {first[key]}, not stored again"})
+                continue
+            if key not in outcomes:
+                upload = files_map[fname]
+                try:
+                    if history.has(upload.digest):
+                        outcomes[key] = (False, "already in history")
+                    else:
+                        file_bytes = upload.read()
+                        outcomes[key] = ingest_upload(history, fname, file_bytes, df,
+                                                      get_processor(fname, file_bytes), digest=upload.digest)
+                except Exception as e:
+                    outcomes[key] = (False, format_error(e))
+            stored, message = outcomes[key]
+            notes.append({"File": fname, "Stored": stored, "Note": message})
+        with st.expander("🗃️ History", expanded=False):
+            st.dataframe(pd.DataFrame(notes), use_container_width=True, hide_index=True)
+            stored_files = history.files()
+            st.caption(f"{len(stored_files)} file(s) across {stored_files['AMC'].nunique()} AMC(s) in the history.")
+            st.dataframe(stored_files.drop(columns="Hash"), use_container_width=True, hide_index=True)
+
     st.markdown('</div>', unsafe_allow_html=True)
 
 # =============================
@@ -0,0 +1,239 @@
+"""Headless batch processing of AMC factsheets.
+
+    python batch.py factsheets/2024-*/ extra/*.xlsx -o allocations.csv -w 8
+
+Every input (directory, glob or file) is expanded to ``.xlsx`` files, routed
+by workbook signature through ``utils.file_router.get_processor`` and run on a process pool. The
+allocations of all files are written as one long-form table (File, Fund,
+Tag, Value) in CSV, Parquet or JSON Lines, chosen by the output extension.
+A per-file report (status, rows, seconds, error) goes next to it. The exit
+status is 1 if any file failed.
+
+File in the table is the path relative to the deepest directory holding
+every input (``2024-01/icici.xlsx``), so same-named files in different
+folders, or in different zip bundles, stay apart.
+
+A ``.zip`` input (given directly or found in a directory) contributes each
+of its ``.xlsx`` members as ``<archive>.zip/<member>``. Nothing is extracted
+to disk: every worker decompresses only the member it is processing
+(``utils.archives``), and members are routed and reported like files.
+
+With ``--all-schemes`` every scheme sheet of each workbook is extracted
+(``utils.schemes``) and the table gains a Scheme column; sheets that hold
+no allocations are listed in the report's Skipped sheets column.
+
+With ``--history DB`` results are also stored in the allocation history
+(``utils.history``). Files whose hash is already there are skipped without
+being processed, so re-running over a growing archive only processes new
+disclosures. The month comes from the file name, the workbook or the
+file's folders (``factsheets/2024-03/icici.xlsx``); a file whose month
+can't be found is processed but reported as ``unstored`` and fails the
+run, since the next run would process it again.
+"""
+import argparse
+import glob
+import os
+import posixpath
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+from utils.archives import is_archive, member_paths, read_source, split_member
+from utils.file_router import get_processor
+from utils.history import HistoryStore, file_hash, ingest_upload
+from utils.readers import DEFAULT_READER, READERS
+from utils.runner import format_error, process_file, process_schemes
+from utils.schemes import ISSUE_COLUMN, SCHEME_COLUMN, scheme_rows
+
+LONG_COLUMNS = ["File", "Fund", "Tag", "Value"]
+SCHEME_LONG_COLUMNS = ["File", "Fund", "Scheme", "Tag", "Value"]
+OUTPUT_FORMATS = (".csv", ".parquet", ".jsonl", ".ndjson")
+STATUS_LABELS = {"ok": "ok ", "error": "ERR", "skipped": "-- ", "unstored": "NS "}
+
+
+def expand_inputs(inputs):
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            matches = [path for ext in ("*.xlsx", "*.zip")
+                       for path in glob.glob(os.path.join(item, "**", ext), recursive=True)]
+        elif glob.has_magic(item):
+            matches = glob.glob(item, recursive=True)
+        else:
+            matches = [item]
+        for path in matches:
+            if is_archive(path):
+                path = os.path.normpath(path)
+                try:
+                    paths.update(member_paths(path))
+                except (zipfile.BadZipFile, OSError):
+                    paths.add(path)  # reported as a failed input
+            # Skip Excel lock files ("~$name.xlsx")
+            elif path.lower().endswith(".xlsx") and not os.path.basename(path).startswith("~$"):
+                paths.add(os.path.normpath(path))
+    return sorted(paths)
+
+
+def input_root(paths):
+    """Deepest directory holding every input."""
+    return os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in paths])
+
+
+def display_name(path, root):
+    """``path`` relative to ``root``, with "/" separators; unique among the inputs."""
+    return os.path.relpath(os.path.abspath(path), root).replace(os.sep, "/")
+
+
+def to_long(file_name, fund, result):
+    return [(file_name, fund, tag, value) for tag, value in result.items()]
+
+
+def schemes_to_long(file_name, fund, table):
+    return [(file_name, fund, *row) for row in scheme_rows(table)]
+
+
+def run_one(path, reader=None, schemes=False, history=None, month=None, label=None):
+    """Process one file in a worker.
+
+    Returns ``(path, long_rows, error, seconds, skipped_sheets, history_note, unstored)``;
+    ``long_rows`` is ``None`` when the file was already in ``history`` and
+    ``unstored`` is True when it was processed but could not be stored
+    there. The rows' File is ``label`` (default: the file name).
+    """
+    start = time.perf_counter()
+    file_name = posixpath.basename(path) if split_member(path) else os.path.basename(path)
+    note = ""
+    try:
+        if is_archive(file_name):
+            raise ValueError(f"{file_name} is not a readable zip archive")
+        file_bytes = read_source(path)
+        store = HistoryStore(history) if history else None
+        if store is not None and store.has(file_hash(file_bytes)):
+            return path, None, None, time.perf_counter() - start, [], "already in history", False
+        processor = get_processor(file_name, file_bytes)
+        fund = processor.__module__.rsplit(".", 1)[-1]
+        if schemes:
+            df = process_schemes(file_name, file_bytes, processor, reader)
+            rows = schemes_to_long(label or file_name, fund, df)
+            skipped = df.loc[df[ISSUE_COLUMN].notna(), SCHEME_COLUMN].tolist()
+        else:
+            df = process_file(file_name, file_bytes, processor, reader)
+            rows = to_long(label or file_name, fund, df)
+            skipped = []
+        unstored = False
+        if store is not None:
+            stored, note = ingest_upload(store, file_name, file_bytes, df, processor, month, path=path)
+            unstored = not stored and note != "already in history"
+        return path, rows, None, time.perf_counter() - start, skipped, note, unstored
+    except Exception as e:
+        return path, None, format_error(e), time.perf_counter() - start, [], note, False
+
+
+def iter_batch(paths, workers, reader=None, schemes=False, history=None, month=None):
+    root = input_root(paths)
+    if workers <= 1:
+        for path in paths:
+            yield run_one(path, reader, schemes, history, month, display_name(path, root))
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_one, path, reader, schemes, history, month, display_name(path, root))
+                   for path in paths]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def write_table(df, path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        df.to_csv(path, index=False)
+    elif ext == ".parquet":
+        df.to_parquet(path, index=False)
+    else:
+        df.to_json(path, orient="records", lines=True)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Extract allocations from AMC factsheets without the UI.")
+    parser.add_argument("inputs", nargs="+", help="Directories, glob patterns, .xlsx files or .zip bundles")
+    parser.add_argument("-o", "--output", default="allocations.csv",
+                        help="Long-form output (.csv, .parquet or .jsonl); default: %(default)s")
+    parser.add_argument("-r", "--report", default=None,
+                        help="Per-file report (status, timings, errors); default: <output>_report.csv")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes; 1 runs inline (default: %(default)s)")
+    parser.add_argument("--reader", choices=list(READERS), default=DEFAULT_READER,
+                        help="Workbook reader (default: %(default)s)")
+    parser.add_argument("--all-schemes", action="store_true",
+                        help="Extract every scheme sheet of each workbook (adds a Scheme column)")
+    parser.add_argument("--history", metavar="DB",
+                        help="Store results in this allocation history database and skip files already in it")
+    parser.add_argument("--month", metavar="YYYY-MM",
+                        help="Disclosure month for --history (default: from each file name or workbook)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Only print the summary")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if os.path.splitext(args.output)[1].lower() not in OUTPUT_FORMATS:
+        print(f"Unsupported output format '{args.output}' (use .csv, .parquet or .jsonl)", file=sys.stderr)
+        return 2
+    report_path = args.report or os.path.splitext(args.output)[0] + "_report.csv"
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        print("No .xlsx files matched the given inputs.", file=sys.stderr)
+        return 2
+
+    long_rows = []
+    report = []
+    start = time.perf_counter()
+    if args.history:
+        HistoryStore(args.history)  # create the schema once, before workers race to
+    results = iter_batch(paths, args.workers, args.reader, args.all_schemes, args.history, args.month)
+    for n, (path, rows, err, seconds, skipped, note, unstored) in enumerate(results, start=1):
+        status = "error" if err is not None else "skipped" if rows is None else "unstored" if unstored else "ok"
+        entry = {
+            "File": path,
+            "Status": status,
+            "Rows": len(rows) if rows is not None else 0,
+            "Seconds": round(seconds, 4),
+            "Error": err or "",
+        }
+        if args.all_schemes:
+            entry["Skipped sheets"] = "; ".join(skipped)
+        if args.history:
+            entry["History"] = note
+        report.append(entry)
+        if status in ("ok", "unstored"):
+            long_rows.extend(rows)
+        if not args.quiet:
+            detail = err or note
+            print(f"[{n}/{len(paths)}] {STATUS_LABELS[status]} {seconds:7.3f}s  {path}" + (f"  -- {detail}" if detail else ""),
+                  file=sys.stderr)
+    elapsed = time.perf_counter() - start
+
+    # Completion order varies with workers; keep the output deterministic (File is unique per input)
+    columns = SCHEME_LONG_COLUMNS if args.all_schemes else LONG_COLUMNS
+    long_df = pd.DataFrame(long_rows, columns=columns).sort_values("File", kind="stable")
+    write_table(long_df, args.output)
+    report_df = pd.DataFrame(report).sort_values("File", kind="stable")
+    report_df.to_csv(report_path, index=False)
+
+    failed = int((report_df["Status"] == "error").sum())
+    unchanged = int((report_df["Status"] == "skipped").sum())
+    unstored = int((report_df["Status"] == "unstored").sum())
+    print(
+        f"{len(paths)} file(s), {len(paths) - failed - unchanged - unstored} ok, {failed} failed"
+        + (f", {unchanged} already in history, {unstored} not stored" if args.history else "")
+        + f" in {elapsed:.2f}s "
+        f"({len(paths) / elapsed if elapsed else 0:.2f} files/s, {args.workers} worker(s)); "
+        f"output: {args.output}, report: {report_path}",
+        file=sys.stderr,
+    )
+    return 1 if failed or unstored else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
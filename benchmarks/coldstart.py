@@ -0,0 +1,94 @@
+"""Cold-start cost of routing and processing, each step in a fresh interpreter.
+
+    python -m benchmarks.coldstart                 # synthetic ICICI workbook
+    python -m benchmarks.coldstart factsheet.xlsx --runs 10
+
+Every step runs in a new ``python`` process, so nothing is already
+imported. ``Seconds`` is the step alone (best of ``--runs``), not the
+interpreter start-up. ``Processors`` counts the built-in processor modules
+it left in ``sys.modules`` and ``pandas`` tells whether pandas got
+imported. The ``--top`` slowest imports of the first result (two levels
+deep) come from ``python -X importtime``.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.synthetic import make_workbook
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STEPS = {
+    "import router": "import utils.file_router",
+    "route by name": "from utils.file_router import get_processor; get_processor(NAME)",
+    "route by content": "from utils.file_router import get_processor; get_processor(NAME, DATA)",
+    "first result": "from utils.runner import process_file; process_file(NAME, DATA)",
+}
+
+PROBE = """
+import json, sys, time
+NAME = sys.argv[1]
+DATA = open(sys.argv[2], "rb").read()
+start = time.perf_counter()
+{code}
+seconds = time.perf_counter() - start
+processors = sum(m.startswith("processors.") for m in sys.modules)
+print(json.dumps({{"seconds": seconds, "processors": processors, "pandas": "pandas" in sys.modules}}))
+"""
+
+
+def probe(code, name, path):
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE.format(code=code), name, path],
+        cwd=ROOT, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def slowest_imports(code, name, path, top):
+    err = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE.format(code=code), name, path],
+        cwd=ROOT, check=True, capture_output=True, text=True,
+    ).stderr
+    rows = []
+    for line in err.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            rows.append((int(parts[1]), parts[2].rstrip()))
+    # Cumulative times nest; the first two levels show who pulled in what
+    rows = [(us, mod.strip()) for us, mod in rows if len(mod) - len(mod.lstrip()) <= 3]
+    return sorted(rows, reverse=True)[:top]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure cold-start import and routing cost.")
+    parser.add_argument("file", nargs="?", help="Factsheet to route and process (default: synthetic ICICI)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="Slowest imports to list")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.file:
+            name, path = os.path.basename(args.file), os.path.abspath(args.file)
+        else:
+            name, path = "icici_factsheet.xlsx", os.path.join(tmp, "icici_factsheet.xlsx")
+            with open(path, "wb") as fh:
+                fh.write(make_workbook("icici", 1000))
+
+        print(f"{'Step':<18} {'Seconds':>8} {'Processors':>10} {'pandas':>7}")
+        for step, code in STEPS.items():
+            results = [probe(code, name, path) for _ in range(args.runs)]
+            best = min(results, key=lambda r: r["seconds"])
+            print(f"{step:<18} {best['seconds']:8.3f} {best['processors']:10d} {str(best['pandas']):>7}")
+
+        print("\nSlowest imports for 'first result' (cumulative ms):")
+        for us, module in slowest_imports(STEPS["first result"], name, path, args.top):
+            print(f"  {us / 1000:8.1f}  {module}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""Load test for the HTTP service (``service.py``).
+
+    python service.py -q &
+    python -m benchmarks.load factsheets/*.xlsx -c 8 -n 200
+    python -m benchmarks.load --synthetic 5000 -c 16 -n 500 --url http://127.0.0.1:8765
+
+Sends ``-n`` POST /process requests with ``-c`` concurrent clients, cycling
+through the given workbooks, and reports throughput, client-side latency
+percentiles, status counts and the server's own /stats.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+from benchmarks.synthetic import LAYOUTS, make_workbook
+
+
+def post(url, name, data, reader=None):
+    query = f"?name={quote(name)}" + (f"&reader={reader}" if reader else "")
+    request = urllib.request.Request(url + "/process" + query, data=data, method="POST",
+                                     headers={"Content-Type": "application/octet-stream"})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        e.read()
+        status = e.code
+    return status, time.perf_counter() - start
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else float("nan")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the processor HTTP service.")
+    parser.add_argument("files", nargs="*", help=".xlsx factsheets to send")
+    parser.add_argument("--synthetic", type=int, metavar="ROWS", help="Also send a generated workbook per AMC layout")
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    parser.add_argument("-c", "--concurrency", type=int, default=8)
+    parser.add_argument("-n", "--requests", type=int, default=100)
+    parser.add_argument("--reader", help="Workbook reader to request")
+    args = parser.parse_args(argv)
+
+    payloads = []
+    for path in args.files:
+        with open(path, "rb") as fh:
+            payloads.append((os.path.basename(path), fh.read()))
+    if args.synthetic:
+        payloads.extend((f"{amc}.xlsx", make_workbook(amc, args.synthetic)) for amc in LAYOUTS)
+    if not payloads:
+        parser.error("give factsheet files and/or --synthetic ROWS")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as clients:
+        results = list(clients.map(
+            lambda i: post(args.url, *payloads[i % len(payloads)], args.reader), range(args.requests)
+        ))
+    elapsed = time.perf_counter() - start
+
+    statuses = {}
+    for status, _ in results:
+        statuses[status] = statuses.get(status, 0) + 1
+    ok = [latency for status, latency in results if status == 200]
+    print(f"{args.requests} requests, concurrency {args.concurrency}, {elapsed:.2f}s "
+          f"({args.requests / elapsed:.1f} req/s); statuses {statuses}")
+    print("latency ms (200s): " + "  ".join(
+        f"{name} {percentile(ok, q) * 1000:.1f}" for name, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))
+    ))
+    with urllib.request.urlopen(args.url + "/stats") as response:
+        print("server: " + json.dumps(json.load(response)))
+    return 0 if len(ok) == args.requests else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
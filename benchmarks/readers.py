@@ -0,0 +1,147 @@
+"""Compare workbook readers on real factsheets.
+
+    python -m benchmarks.readers factsheets/*.xlsx -n 5
+    python -m benchmarks.readers --synthetic 40000
+
+For every file the processor is chosen as in the app. Two things are timed
+with each reader: reading the processor's columns of its sheet ("read"), and
+the whole processor call ("process"). The best of ``-n`` runs is reported,
+along with the speedup over the first reader. The script also checks that
+every reader yields the same extracted values.
+
+``Peak MB`` is how far one processor call raised the peak resident set
+size of a fresh process, so native allocations (calamine) count as well.
+Skip it with ``--no-memory``. At the end the script names the fastest
+reader whose allocations matched the first reader's on every file.
+"""
+import argparse
+import gc
+import multiprocessing
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from benchmarks.synthetic import LAYOUTS, make_workbook
+from utils.file_router import get_processor
+from utils.readers import READERS, open_workbook
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def best_of(n, fn):
+    best = float("inf")
+    for _ in range(n):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def read_columns(file_bytes, spec, reader):
+    with open_workbook(file_bytes, reader) as book:
+        return book.columns(spec["columns"], sheet=spec.get("sheet", 0))
+
+
+def max_rss_mb(reset=False):
+    """Peak RSS of this process so far; on Linux ``reset`` restarts it from the current RSS."""
+    try:
+        if reset:
+            with open("/proc/self/clear_refs", "w") as fh:
+                fh.write("5")
+        with open("/proc/self/status") as fh:
+            return int(re.search(r"VmHWM:\s+(\d+)", fh.read()).group(1)) / 2**10
+    except OSError:  # no procfs: the lifetime peak, so earlier peaks can hide the call's
+        if resource is None:
+            return float("nan")
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss / 2**20 if sys.platform == "darwin" else rss / 2**10  # bytes on macOS, KiB elsewhere
+
+
+def _peak_growth(name, file_bytes, reader):
+    import utils.rules  # noqa: F401  (imports are not part of the measurement)
+    processor = get_processor(name, file_bytes)
+    open_workbook(file_bytes, reader).close()
+    gc.collect()
+    before = max_rss_mb(reset=True)
+    processor(file_bytes, reader=reader)
+    return max_rss_mb() - before
+
+
+def peak_mb(name, file_bytes, reader):
+    """Peak RSS growth of one processor call, measured in a new interpreter."""
+    with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return pool.submit(_peak_growth, name, file_bytes, reader).result()
+
+
+def bench_file(path, readers, repeat, file_bytes=None, memory=True):
+    if file_bytes is None:
+        with open(path, "rb") as fh:
+            file_bytes = fh.read()
+    processor = get_processor(os.path.basename(path), file_bytes)
+    spec = sys.modules[processor.__module__].SPEC
+    rows = []
+    reference = None
+    for reader in readers:
+        read_s, data = best_of(repeat, lambda: read_columns(file_bytes, spec, reader))
+        proc_s, df = best_of(repeat, lambda: processor(file_bytes, reader=reader))
+        if reference is None:
+            reference = df
+        rows.append({
+            "File": os.path.basename(path),
+            "MB": round(len(file_bytes) / 2**20, 2),
+            "Rows": len(data),
+            "Reader": reader,
+            "Read s": round(read_s, 4),
+            "Process s": round(proc_s, 4),
+            "Peak MB": round(peak_mb(os.path.basename(path), file_bytes, reader), 1) if memory else None,
+            "Same output": df == reference,
+        })
+    for row in rows:
+        row["Read speedup"] = round(rows[0]["Read s"] / row["Read s"], 2)
+        row["Process speedup"] = round(rows[0]["Process s"] / row["Process s"], 2)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("files", nargs="*", help=".xlsx factsheets")
+    parser.add_argument("--synthetic", type=int, metavar="ROWS",
+                        help="Also bench a generated workbook of this many rows per AMC layout")
+    parser.add_argument("-n", "--repeat", type=int, default=3, help="Runs per measurement (best is kept)")
+    parser.add_argument("--readers", nargs="+", default=list(READERS), choices=list(READERS))
+    parser.add_argument("--no-memory", dest="memory", action="store_false",
+                        help="Skip the peak memory runs (one fresh process per file and reader)")
+    args = parser.parse_args(argv)
+
+    if not args.files and not args.synthetic:
+        parser.error("give factsheet files and/or --synthetic ROWS")
+
+    rows = []
+    for path in args.files:
+        rows.extend(bench_file(path, args.readers, args.repeat, memory=args.memory))
+    if args.synthetic:
+        for amc in LAYOUTS:
+            file_bytes = make_workbook(amc, args.synthetic)
+            rows.extend(bench_file(f"{amc}.xlsx", args.readers, args.repeat, file_bytes, args.memory))
+    df = pd.DataFrame(rows)
+    if not args.memory:
+        df = df.drop(columns="Peak MB")
+    print(df.to_string(index=False))
+
+    by_reader = df.groupby("Reader", sort=False).agg(total=("Process s", "sum"), same=("Same output", "all"))
+    matching = by_reader[by_reader["same"]]
+    fastest = matching["total"].idxmin()
+    print(f"\nFastest reader with identical allocations: {fastest} "
+          f"({matching.loc[fastest, 'total']:.3f}s processing in total, "
+          f"vs {by_reader['total'].iloc[0]:.3f}s for {by_reader.index[0]})")
+    return 0 if df["Same output"].all() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
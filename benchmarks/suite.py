@@ -0,0 +1,179 @@
+"""Scaling benchmarks for every processor on synthetic factsheets.
+
+    python -m benchmarks.suite                                  # 100 .. 100k rows, all AMCs
+    python -m benchmarks.suite --amcs icici hdfc --sizes 100 1000 10000
+    python -m benchmarks.suite --save benchmarks/baselines/local.json
+    python -m benchmarks.suite --compare benchmarks/baselines/local.json
+
+For each AMC layout and size a workbook is generated (``benchmarks.synthetic``)
+and the processor's two phases are timed separately, keeping the best of
+``--repeat`` runs:
+
+    parse    reading the spec's columns of its sheet (``utils.rules.read_sheet``)
+    extract  evaluating the rules over them (``utils.rules.extract``)
+
+The peak traced allocation of one whole processor call is recorded with
+tracemalloc. Per AMC and phase a power law ``seconds = c * rows ** k`` is
+fitted in log-log space; ``k`` close to 1 is linear, close to 2 quadratic.
+
+``--save`` writes results and fits as JSON. ``--compare`` re-runs the same
+cases against such a baseline and exits 1 if a phase got slower than
+``--tolerance`` times the baseline (ignoring differences under
+``--floor`` seconds), or its scaling exponent grew by more than 0.25.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+from benchmarks.synthetic import LAYOUTS, make_workbook
+from utils.file_router import get_processor
+from utils.readers import DEFAULT_READER, READERS
+from utils.rules import extract, read_sheet
+
+SIZES = [100, 1000, 10000, 100000]
+PHASES = ["parse", "extract"]
+EXPONENT_SLACK = 0.25
+
+
+def best_of(n, fn):
+    best = float("inf")
+    for _ in range(n):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def peak_memory(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_case(amc, rows, reader, repeat):
+    file_bytes = make_workbook(amc, rows)
+    processor = get_processor(f"{amc}.xlsx", file_bytes)
+    spec = sys.modules[processor.__module__].SPEC
+    parse_s, data = best_of(repeat, lambda: read_sheet(spec, file_bytes, reader))
+    extract_s, _ = best_of(repeat, lambda: extract(spec, data))
+    return {
+        "amc": amc,
+        "rows": rows,
+        "sheet_rows": len(data),
+        "bytes": len(file_bytes),
+        "parse": parse_s,
+        "extract": extract_s,
+        "peak_mb": peak_memory(lambda: processor(file_bytes, reader=reader)) / 2**20,
+    }
+
+
+def fit_scaling(results):
+    """``{amc: {phase: {"exponent": k, "coef": c}}}`` from a power-law fit."""
+    df = pd.DataFrame(results)
+    fits = {}
+    for amc, group in df.groupby("amc"):
+        if group["sheet_rows"].nunique() < 2:
+            continue
+        x = np.log(group["sheet_rows"].to_numpy(dtype=float))
+        fits[amc] = {}
+        for phase in PHASES + ["peak_mb"]:
+            y = np.log(np.maximum(group[phase].to_numpy(dtype=float), 1e-9))
+            k, log_c = np.polyfit(x, y, 1)
+            fits[amc][phase] = {"exponent": round(float(k), 3), "coef": float(np.exp(log_c))}
+    return fits
+
+
+def compare(current, baseline, tolerance, floor):
+    """Regression messages for ``current`` against ``baseline`` (both suite JSON dicts)."""
+    problems = []
+    old = {(r["amc"], r["rows"]): r for r in baseline["results"]}
+    for r in current["results"]:
+        base = old.get((r["amc"], r["rows"]))
+        if base is None:
+            continue
+        for phase in PHASES:
+            if r[phase] > base[phase] * tolerance and r[phase] - base[phase] > floor:
+                problems.append(
+                    f"{r['amc']} {r['rows']} rows {phase}: {r[phase]:.4f}s vs {base[phase]:.4f}s "
+                    f"({r[phase] / base[phase]:.2f}x)"
+                )
+    for amc, phases in current["fits"].items():
+        for phase in PHASES:
+            before = baseline.get("fits", {}).get(amc, {}).get(phase)
+            now = phases[phase]["exponent"]
+            if before and now > before["exponent"] + EXPONENT_SLACK:
+                problems.append(f"{amc} {phase} scaling: n^{now:.2f} vs n^{before['exponent']:.2f}")
+    return problems
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Processor scaling benchmarks on synthetic factsheets.")
+    parser.add_argument("--amcs", nargs="+", default=list(LAYOUTS), choices=list(LAYOUTS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=SIZES, help="Holdings rows (default: %(default)s)")
+    parser.add_argument("--reader", default=DEFAULT_READER, choices=list(READERS))
+    parser.add_argument("-n", "--repeat", type=int, default=3, help="Runs per measurement (best is kept)")
+    parser.add_argument("--save", help="Write results and fits to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="Allowed slowdown factor (default: %(default)s)")
+    parser.add_argument("--floor", type=float, default=0.005,
+                        help="Ignore slowdowns smaller than this many seconds (default: %(default)s)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)
+        # Re-run exactly what the baseline measured
+        args.reader = baseline["meta"]["reader"]
+
+    results = []
+    for amc in args.amcs:
+        for rows in sorted(args.sizes):
+            r = bench_case(amc, rows, args.reader, args.repeat)
+            results.append(r)
+            print(
+                f"{amc:12s} {rows:>7d} rows  parse {r['parse']:8.4f}s  extract {r['extract']:8.4f}s  "
+                f"peak {r['peak_mb']:7.1f} MB",
+                file=sys.stderr,
+            )
+
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "reader": args.reader,
+            "repeat": args.repeat,
+        },
+        "results": results,
+        "fits": fit_scaling(results),
+    }
+    for amc, phases in report["fits"].items():
+        print(f"{amc:12s} " + "  ".join(f"{p} ~ n^{f['exponent']:.2f}" for p, f in phases.items()))
+
+    if args.save:
+        with open(args.save, "w") as fh:
+            json.dump(report, fh, indent=2)
+    if baseline is not None:
+        problems = compare(report, baseline, args.tolerance, args.floor)
+        for p in problems:
+            print("REGRESSION " + p)
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+"""Synthetic factsheets in each AMC's layout, for benchmarks.
+
+``make_workbook(amc, n_rows)`` returns .xlsx bytes whose scheme sheet has
+about ``n_rows`` holdings spread over the sections the processor looks for
+(equity, debt, foreign, derivatives, REITs, gold / silver, cash), headed by
+the fund-house title and laid out in the AMC's columns. The output is
+deterministic for a given seed.
+"""
+import random
+from io import BytesIO
+
+from openpyxl import Workbook
+
+TITLES = {
+    "adityabirla": "Aditya Birla Sun Life Mutual Fund",
+    "axis": "Axis Mutual Fund",
+    "baroda": "Baroda BNP Paribas Mutual Fund",
+    "hdfc": "HDFC Mutual Fund",
+    "hsbc": "HSBC Mutual Fund",
+    "icici": "ICICI Prudential Mutual Fund",
+    "mahindra": "Mahindra Manulife Mutual Fund",
+    "mirae": "Mirae Asset Mutual Fund",
+    "shriram": "Shriram Mutual Fund",
+    "sundaram": "Sundaram Mutual Fund",
+}
+
+# Column layout per AMC: (sheet name or None for first sheet, category column, value column, width)
+LAYOUTS = {
+    "adityabirla": (None, 1, 6, 8),
+    "axis": (None, 1, 6, 8),
+    "baroda": (None, 1, 7, 9),
+    "hdfc": ("MY2005", 1, 7, 12),
+    "hsbc": (None, 0, 5, 7),
+    "icici": ("MULTI", 1, 7, 9),
+    "mahindra": ("MMF23", 1, 6, 8),
+    "mirae": (None, 1, 6, 8),
+    "shriram": (None, 1, 6, 8),
+    "sundaram": (None, 2, 6, 8),
+}
+
+
+def _holdings(rng, count, value_scale=1.0):
+    rows = []
+    for k in range(count):
+        rows.append((f"Company {rng.randint(100, 999)}{k} Ltd", round(rng.uniform(0.01, 2.5) * value_scale, 4)))
+    return rows
+
+
+def _block(rng, header, count, closers=("Sub Total", "Total")):
+    rows = [(header, None)]
+    holdings = _holdings(rng, count)
+    rows += holdings
+    total = round(sum(v for _, v in holdings), 4)
+    rows += [(c, total) for c in closers]
+    return rows
+
+
+def _split(n, parts):
+    base = max(n // parts, 1)
+    return [base] * parts
+
+
+def _rows_standard(rng, n):
+    # mirae / shriram / mahindra style
+    eq, debt, foreign, deriv = _split(n, 4)
+    rows = [("Portfolio Statement", None), ("Name of the Instrument", "% to NAV")]
+    rows += [("Equity & Equity related", None)]
+    rows += _block(rng, "(a) Listed / awaiting listing on Stock Exchanges", eq)
+    rows += _block(rng, "Foreign Securities and/or overseas ETF", foreign)
+    rows += _block(rng, "Derivatives", 0)[:1] + [(f"Company {k} Ltd Futures", -round(rng.uniform(0.01, 0.5), 4)) for k in range(deriv)]
+    rows += [("Total", -1.5)]
+    rows += [("Debt instruments", None)]
+    rows += _block(rng, "(a) Listed / awaiting listing on Stock Exchanges", debt)
+    rows += _block(rng, "Real Estate Investment Trust", 3)
+    rows += _block(rng, "REITs", 2, closers=("Total",))
+    rows += _block(rng, "InvITs", 2, closers=("Total",))
+    rows += [("Gold ETF Units", 1.25), ("Silver ETF Units", 0.75), ("Gold Bees", "nil")]
+    rows += _block(rng, "TREPS / Reverse Repo Investments", 1, closers=("Sub Total", "Total"))
+    rows += [("Net Receivables / (Payables)", 0.42), ("Grand Total", 100.0)]
+    return rows
+
+
+def _rows_sundaram(rng, n):
+    eq, debt, foreign, deriv = _split(n, 4)
+    rows = [("Portfolio Statement", None)]
+    rows += _block(rng, "Equity & Equity related", eq)
+    rows += _block(rng, "Debt Instruments", debt, closers=("Sub Total",))
+    rows += [("Total for Debt Instruments", 12.5)]
+    rows += _block(rng, "Treasury Bills", 3)
+    rows += _block(rng, "REITs", 2, closers=("Total",))
+    rows += _block(rng, "InvITs", 2, closers=("Total",))
+    rows += _block(rng, "Foreign Securities", foreign)
+    rows += _block(rng, "Derivative", deriv)
+    rows += [("Gold ETF", 1.1), ("Silver ETF", 0.6)]
+    rows += _block(rng, "TREPS", 1)
+    rows += [("Margin Money for Derivatives", -0.3), ("Cash and Other Net Current Assets", -0.2), ("Grand Total", 100.0)]
+    return rows
+
+
+def _rows_axis(rng, n, reit_label="REIT"):
+    eq, debt, foreign, deriv = _split(n, 4)
+    rows = [("Portfolio Statement", None)]
+    rows += _block(rng, "Equity & Equity related", eq)
+    rows += _block(rng, "Derivatives", deriv)
+    rows += _block(rng, "Debt Instruments", debt)
+    rows += _block(rng, "Money Market Instruments", 3)
+    rows += _block(rng, "Foreign Securities", foreign)
+    rows += _block(rng, reit_label + "s", 2)
+    rows += _block(rng, "InvITs", 2)
+    rows += [("Gold ETF", 1.0), ("Silver ETF", 0.5), ("Gold Bees", "-")]
+    rows += _block(rng, "Reverse Repo / TREPS", 1)
+    rows += [("Net Receivables / (Payables)", 0.3), ("Grand Total", 100.0)]
+    return rows
+
+
+def _rows_hsbc(rng, n):
+    eq, debt, foreign, hedge = _split(n, 4)
+    rows = [("Portfolio Statement", None)]
+    rows += _block(rng, "Equity & Equity Related Instruments", eq)
+    rows += _block(rng, "Hedged Equity", hedge)
+    rows += [("Debt Instruments", None)]
+    rows += _block(rng, "Government Securities", debt)
+    rows += _block(rng, "Corporate Bonds", 3)
+    rows += _block(rng, "Commercial Paper", 2)
+    rows += _block(rng, "Exchange Traded Fund", 2)
+    rows += _block(rng, "Units of REITs", 2)
+    rows += _block(rng, "Foreign Securities", foreign)
+    rows += [("Silver ETF", "1,234.5"), ("TREPS", 2.0), ("Net Current Assets", -0.4), ("Grand Total", 100.0)]
+    return rows
+
+
+def _rows_icici(rng, n):
+    eq, debt, foreign, deriv = _split(n, 4)
+    rows = [("Portfolio", None), ("Equity Shares", None), ("Listed / awaiting listing on Stock Exchanges", 65.2)]
+    rows += _holdings(rng, eq)
+    rows += [("Foreign Securities and/or overseas ETF", 4.1)]
+    rows += _holdings(rng, foreign)
+    rows += [("Debt Instruments", 10.5), ("Money Market Instruments", 3.2), ("Compulsory Convertible Debenture", 0.7)]
+    rows += _holdings(rng, debt)
+    rows += [("Units of REIT", 1.1), ("Units of InvIT", 0.9), ("Gold ETF", 2.2), ("Silver ETF", 1.3)]
+    rows += [("Exchange Traded Commodity Derivatives", None)] + [(f"Gold Mini {k}", 0.1) for k in range(3)] + [(None, None)]
+    rows += [("Stock / Index Futures", None)] + [(f"Company {k} Ltd Futures", -round(rng.uniform(0.01, 0.5), 4)) for k in range(deriv)] + [(None, None)]
+    rows += [("TREPS", 2.4), ("Net Current Assets", -0.3), ("Total Net Assets", 100.0)]
+    return rows
+
+
+def _rows_adityabirla(rng, n):
+    eq, debt, foreign, deriv = _split(n, 4)
+    rows = [("Name of Instrument", "% to Net Assets")]
+    rows += _block(rng, "Equity & Equity related", eq, closers=("Total",))
+    rows += _block(rng, "Foreign Securities and/or overseas ETF", foreign, closers=("Total",))
+    rows += _block(rng, "Debt Instruments", debt, closers=("Total",))
+    rows += _block(rng, "Money Market Instruments", 3, closers=("Total",))
+    rows += _block(rng, "REIT", 2, closers=("Total",))
+    rows += _block(rng, "InvIT", 2, closers=("Total",))
+    rows += [("Gold ETF", 1.2), ("Silver ETF", 0.8)]
+    rows += _block(rng, "TREPS", 1, closers=("Total",))
+    rows += _block(rng, "Net Receivables / (Payables)", 1, closers=("Total",))
+    rows += [("Margin (Future and Options)", 0.25)]
+    rows += [("Disclosure in derivatives", None)] + [(f"Company {k} Ltd Futures", -round(rng.uniform(0.01, 0.5), 4)) for k in range(deriv)] + [(None, None)]
+    rows += [("Grand Total", 100.0)]
+    return rows
+
+
+def _rows_hdfc(rng, n, width):
+    # HDFC carries the portfolio classification block in columns 1/3 and holdings in 1/3/7
+    out = []
+    out.append({1: "Portfolio Classification", 3: None})
+    out.append({1: "Equity", 3: 70.1})
+    out.append({1: "Total Hedged Exposure", 3: 5.2})
+    out.append({1: "Units issued by ReIT", 3: 1.4})
+    out.append({1: "Units issued by InvIT", 3: 0.8})
+    out.append({1: "Cash, Cash Equivalents and Net Current Assets", 3: 3.3})
+    out.append({1: "CD", 3: 1.9})
+    out.append({1: None})
+    eq, debt, intl, _ = _split(n, 4)
+    out.append({1: "Equity & Equity Related"})
+    for name, val in _holdings(rng, eq):
+        out.append({1: f"INE{rng.randint(100000, 999999)}01", 3: name, 7: val, 10: 7.1, 11: "Sovereign"})
+    out.append({1: "Debt Instruments"})
+    for name, val in _holdings(rng, debt):
+        out.append({1: f"INE{rng.randint(100000, 999999)}02", 3: name, 7: val})
+    out.append({1: "Total", 7: 12.0})
+    out.append({1: "International"})
+    for name, val in _holdings(rng, intl):
+        out.append({1: f"US{rng.randint(100000, 999999)}03", 3: name, 7: val})
+    out.append({1: "Total", 7: 6.0})
+    out.append({1: "Mutual Fund Units"})
+    out.append({1: "INF179K01XX1", 3: "HDFC Gold ETF Fund of Fund", 7: 1.7})
+    out.append({1: "INF179K01XX2", 3: "HDFC Silver ETF", 7: 0.9})
+    out.append({1: "INF179K01XX3", 7: 0.4})
+    out.append({1: None})
+    return [[r.get(c) for c in range(width)] for r in out]
+
+
+ROW_BUILDERS = {
+    "adityabirla": _rows_adityabirla,
+    "axis": _rows_axis,
+    "baroda": lambda rng, n: _rows_axis(rng, n, reit_label="REIT"),
+    "hsbc": _rows_hsbc,
+    "icici": _rows_icici,
+    "mahindra": _rows_standard,
+    "mirae": _rows_standard,
+    "shriram": _rows_standard,
+    "sundaram": _rows_sundaram,
+}
+
+
+def build_rows(amc, n_rows, seed=0):
+    rng = random.Random(seed)
+    sheet, cat_col, val_col, width = LAYOUTS[amc]
+    title = [None] * width
+    title[cat_col] = TITLES[amc] + " - Monthly Portfolio Statement"
+    if amc == "hdfc":
+        return [title] + _rows_hdfc(rng, n_rows, width)
+    rows = [title]
+    for cat, val in ROW_BUILDERS[amc](rng, n_rows):
+        row = [None] * width
+        row[cat_col] = cat
+        row[val_col] = val
+        if isinstance(cat, str) and cat.startswith("Company"):
+            row[0 if cat_col else 1] = f"INE{rng.randint(100000, 999999)}01"
+        rows.append(row)
+    return rows
+
+
+def make_workbook(amc, n_rows, seed=0, extra_sheets=0):
+    sheet, _, _, _ = LAYOUTS[amc]
+    # write_only streams rows to disk, which keeps 100k-row sheets cheap
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet or "Scheme1")
+    for row in build_rows(amc, n_rows, seed):
+        ws.append(row)
+    for k in range(extra_sheets):
+        other = wb.create_sheet(f"Other{k}")
+        for row in build_rows(amc, n_rows, seed + k + 1):
+            other.append(row)
+    buf = BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
@@ -0,0 +1,69 @@
+"""Portfolio look-through from processed allocations.
+
+    python batch.py factsheets/ -o allocations.csv
+    python lookthrough.py holdings.csv --allocations allocations.csv -o exposure.csv
+    python lookthrough.py holdings.csv --history ~/.local/share/mutualfund/history.sqlite --month 2024-03
+
+``holdings`` is long-form (CSV or Parquet): Portfolio, Fund, and Amount or
+Units and NAV. With ``--allocations`` (the output of ``batch.py``) a fund
+is named by its File there, the path relative to the batch inputs (e.g.
+``2024-03/icici.xlsx``), plus ``" / <scheme>"`` for ``--all-schemes``
+output; with ``--history`` it is ``"<AMC> / <scheme>"`` and each scheme's
+latest month is used unless ``--month`` is given. Every portfolio's blended
+exposure is computed in one matrix product (``utils.lookthrough``) and
+written with a row per portfolio.
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+from utils.history import HistoryStore
+from utils.lookthrough import PORTFOLIO_COLUMN, history_matrix, long_matrix, look_through, read_holdings
+
+READERS = {".csv": pd.read_csv, ".parquet": pd.read_parquet, ".jsonl": lambda p: pd.read_json(p, lines=True)}
+
+
+def read_allocations(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in READERS:
+        raise ValueError(f"Unsupported allocations format '{path}' (use .csv, .parquet or .jsonl)")
+    df = READERS[ext](path)
+    return long_matrix(df, ["File", "Scheme"] if "Scheme" in df else ["File"])
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Blended asset-class exposure of many portfolios.")
+    parser.add_argument("holdings", help="Long-form holdings: Portfolio, Fund, Amount (or Units and NAV)")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--allocations", metavar="FILE", help="Long-form output of batch.py")
+    source.add_argument("--history", metavar="DB", help="Allocation history database")
+    parser.add_argument("--month", metavar="YYYY-MM", help="History month (default: each scheme's latest)")
+    parser.add_argument("-o", "--output", default="exposure.csv", help="Output CSV (default: %(default)s)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    start = time.perf_counter()
+    try:
+        if args.allocations:
+            funds = read_allocations(args.allocations)
+        else:
+            funds = history_matrix(HistoryStore(args.history), args.month)
+        exposure = look_through(funds, read_holdings(args.holdings))
+    except (KeyError, ValueError) as e:
+        print(e.args[0] if e.args else e, file=sys.stderr)
+        return 2
+    exposure.reset_index().rename(columns={"index": PORTFOLIO_COLUMN}).to_csv(args.output, index=False)
+    print(
+        f"{len(exposure)} portfolio(s) over {len(funds)} fund(s) in {time.perf_counter() - start:.2f}s; "
+        f"output: {args.output}",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
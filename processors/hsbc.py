@@ -1,94 +1,38 @@
-import pandas as pd
-from io import BytesIO
-
-def process_hsbc(file_bytes):
-    df = pd.read_excel(BytesIO(file_bytes), header=None)
-    df_filtered = df.iloc[:, [0, 5]].copy()
-    df_filtered.columns = ["Category", "Value"]
-    df_filtered["Tag"] = None
-    df_filtered["Final Value"] = None
-
-    def find_total_after(keyword, n=1):
-        count = 0
-        total = 0.0
-        start = None
-        for i, val in enumerate(df_filtered["Category"]):
-            if isinstance(val, str) and keyword.lower() in val.lower():
-                start = i
-                break
-        if start is not None:
-            for j in range(start + 1, len(df_filtered)):
-                val = str(df_filtered.loc[j, "Category"]).strip().lower()
-                if val == "total" or val == "sub total":
-                    try:
-                        val_to_add = float(df_filtered.loc[j, "Value"])
-                        if not pd.isna(val_to_add):
-                            total += val_to_add
-                            count += 1
-                    except:
-                        pass
-                    if count == n:
-                        break
-        return total
-
-    net_equity_value = find_total_after("Equity & Equity Related Instruments", 1)
-    hedged_equity_value = find_total_after("Hedged Equity", 1)
-    debt_value = find_total_after("Debt Instruments", 3)
-    gold_value = find_total_after("Exchange Traded Fund", 1)
-
-    # Cash (TREPS + Net Current Assets)
-    treps_value = nca_value = 0.0
-    for i, val in enumerate(df_filtered["Category"]):
-        if isinstance(val, str):
-            if "treps" in val.lower():
-                try:
-                    treps_value = float(df_filtered.loc[i, "Value"])
-                except:
-                    pass
-            if "net current assets" in val.lower():
-                try:
-                    nca_value = float(df_filtered.loc[i, "Value"])
-                except:
-                    pass
-    cash_value = treps_value + nca_value
-
-    # ReIT/InvIT
-    reit_invit_value = 0.0
-    for i, val in enumerate(df_filtered["Category"]):
-        if isinstance(val, str) and ("reits" in val.lower() or "invits" in val.lower()):
-            reit_invit_value = find_total_after(val, 1)
-            break
-
-    # International Equity
-    foreign_value = 0.0
-    for i, val in enumerate(df_filtered["Category"]):
-        if isinstance(val, str) and "foreign" in val.lower():
-            foreign_value = find_total_after(val, 1)
-            break
-
-    # Silver
-    silver_value = 0.0
-    for i, val in enumerate(df_filtered["Category"]):
-        if isinstance(val, str) and "silver" in val.lower():
-            raw_val = df_filtered.loc[i, "Value"]
-            if pd.notna(raw_val):
-                try:
-                    silver_value += float(str(raw_val).replace(",", "").strip())
-                except:
-                    continue
-
-    summary_df = pd.DataFrame({
-        "Category": [None] * 8,
-        "Value": [None] * 8,
-        "Tag": [
-            "Net Equity", "Hedged Equity", "Debt", "Gold", "Cash",
-            "ReIT/InvIT", "International Equity", "Silver"
-        ],
-        "Final Value": [
-            net_equity_value, hedged_equity_value, debt_value, gold_value, cash_value,
-            reit_invit_value, foreign_value, silver_value
-        ]
-    })
-
-    final_df = pd.concat([summary_df, df_filtered], ignore_index=True)
-    return final_df[["Tag", "Final Value"]]
+from utils.tags import Tag
+
+VERSION = 1
+
+# Fund-house names that identify the workbook (see utils.file_router)
+MARKERS = ["hsbc mutual fund"]
+
+def total_after(*anchors, **rule):
+    return {"op": "total", "anchors": list(anchors), "kinds": ("total", "sub total"), **rule}
+
+SPEC = {
+    "columns": [0, 5],
+    "rules": {
+        "equity": total_after("equity & equity related instruments"),
+        "hedged": total_after("hedged equity"),
+        "debt": total_after("debt instruments", n=3),
+        "gold": total_after("exchange traded fund"),
+        "treps": {"anchors": ["treps"], "pick": "last_ok"},
+        "nca": {"anchors": ["net current assets"], "pick": "last_ok"},
+        "reit": total_after("reits", "invits", combine="earliest"),
+        "foreign": total_after("foreign"),
+        "silver": {"anchors": ["silver"], "pick": "all"},
+    },
+    "tags": [
+        (Tag.NET_EQUITY, "equity"),
+        (Tag.HEDGED_EQUITY, "hedged"),
+        (Tag.DEBT, "debt"),
+        (Tag.GOLD, "gold"),
+        (Tag.CASH, "treps + nca"),
+        (Tag.REIT_INVIT, "reit"),
+        (Tag.INTERNATIONAL_EQUITY, "foreign"),
+        (Tag.SILVER, "silver"),
+    ],
+}
+
+def process_hsbc(file_bytes, reader=None):
+    from utils.rules import run_spec  # loaded on first use (see utils.file_router)
+    return run_spec(SPEC, file_bytes, reader)
@@ -0,0 +1,324 @@
+"""Local HTTP service for the AMC processors.
+
+    python service.py --port 8765 -w 4 --queue 32
+
+Endpoints (JSON responses):
+
+    POST /process?name=<file.xlsx>[&reader=stream][&schemes=1]
+        body: the raw .xlsx bytes
+    POST /batch[?reader=...][&schemes=1]
+        body: multipart/form-data, one file part per workbook
+    GET  /health
+    GET  /stats      in-flight work, rejections and latency percentiles
+
+Uploads are routed through ``get_processor`` and run on a process pool that
+is spawned and warmed (pandas, openpyxl and every processor imported) before
+the server accepts connections. At most ``workers`` files run at once and
+``queue`` more may wait; anything beyond that is refused with 503 and a
+Retry-After header instead of piling up. If a worker dies the pool is
+replaced, the files it held fail with an error and later requests run on
+the new pool. Every result carries its latency (from its own submission
+to its completion) and stage timings, and ``/stats`` aggregates recent
+latencies for load tests (see ``benchmarks/load.py``).
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from utils.allocation import AllocationResult
+from utils.readers import DEFAULT_READER, READERS
+from utils.runner import format_error, profile_file
+from utils.schemes import scheme_rows
+
+MAX_BODY = int(float(os.environ.get("MF_SERVICE_MAX_MB", "200")) * 2**20)
+LATENCY_WINDOW = 1000
+
+
+def warm():
+    """Pool initializer: import everything a job needs before the first request."""
+    import utils.rules  # noqa: F401  (pandas, openpyxl and the readers)
+    from utils.file_router import REGISTRY
+    REGISTRY.modules()
+
+
+def allocations(result):
+    """JSON-ready allocation rows of an ``AllocationResult`` or a scheme table."""
+    if isinstance(result, AllocationResult):
+        return [{"tag": tag, "value": value} for tag, value in result.items()]
+    return [{"scheme": s, "tag": t, "value": v} for s, t, v in scheme_rows(result)]
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else None
+
+
+class Service:
+    """The warm pool plus admission control and latency bookkeeping."""
+
+    def __init__(self, workers, queue):
+        self.workers = workers
+        self.pool = self.spawn()
+        self.capacity = workers + queue
+        self.slots = threading.BoundedSemaphore(self.capacity)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.processed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.started = time.time()
+
+    def spawn(self):
+        return ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"), initializer=warm
+        )
+
+    def replace(self, broken):
+        """Swap a broken pool for a fresh one (once, however many requests notice)."""
+        with self.lock:
+            if self.pool is broken:
+                self.pool = self.spawn()
+                broken.shutdown(wait=False, cancel_futures=True)
+            return self.pool
+
+    def submit(self, *args):
+        pool = self.pool
+        try:
+            future = pool.submit(profile_file, *args)
+        except BrokenProcessPool:
+            pool = self.replace(pool)
+            future = pool.submit(profile_file, *args)
+        future.pool = pool
+        future.add_done_callback(lambda f: setattr(f, "finished", time.perf_counter()))
+        return future
+
+    def warm_up(self):
+        # Force every worker to spawn and run its initializer now
+        list(self.pool.map(abs, range(self.workers * 2)))
+
+    def admit(self, n):
+        """Reserve ``n`` slots without waiting; False if the service is full."""
+        taken = 0
+        while taken < n and self.slots.acquire(blocking=False):
+            taken += 1
+        if taken < n:
+            for _ in range(taken):
+                self.slots.release()
+            with self.lock:
+                self.rejected += 1
+            return False
+        with self.lock:
+            self.in_flight += n
+        return True
+
+    def run(self, files, reader, schemes):
+        """Process admitted ``(file_name, file_bytes)`` pairs on the pool; one JSON result each.
+
+        Each admitted slot is given back once its file is done. If this
+        fails part-way, files still on the pool are cancelled or waited for
+        first, so admission never lets in more than ``capacity`` files.
+        """
+        results = []
+        futures = []
+        settled = 0
+        try:
+            for name, data in files:
+                futures.append((name, time.perf_counter(), self.submit(name, data, None, reader, False, schemes)))
+            for name, submitted, future in futures:
+                df, err, stages = None, None, []
+                try:
+                    df, err, stages = future.result()
+                except Exception as e:  # the worker itself failed, e.g. it was killed
+                    err = format_error(e)
+                    if isinstance(e, BrokenProcessPool):
+                        self.replace(future.pool)
+                finally:
+                    latency = getattr(future, "finished", time.perf_counter()) - submitted
+                    self.slots.release()
+                    settled += 1
+                    with self.lock:
+                        self.in_flight -= 1
+                        self.processed += 1
+                        self.failed += err is not None
+                        self.latencies.append(latency)
+                result = {"file": name, "ok": err is None, "latency_ms": round(latency * 1000, 2),
+                          "stages": [{k: r[k] for k in ("stage", "seconds")} for r in stages]}
+                if err is None:
+                    result["allocations"] = allocations(df)
+                else:
+                    result["error"] = err
+                results.append(result)
+        finally:
+            left = futures[settled:]
+            wait([future for _, _, future in left if not future.cancel()])
+            for _ in range(len(files) - settled):
+                self.slots.release()
+            with self.lock:
+                self.in_flight -= len(files) - settled
+        return results
+
+    def stats(self):
+        with self.lock:
+            latencies = list(self.latencies)
+            stats = {
+                "uptime_s": round(time.time() - self.started, 1),
+                "workers": self.workers,
+                "capacity": self.capacity,
+                "in_flight": self.in_flight,
+                "processed": self.processed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+            }
+        for name, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+            value = percentile(latencies, q)
+            stats[f"latency_{name}_ms"] = round(value * 1000, 2) if value is not None else None
+        return stats
+
+
+def multipart_files(content_type, body):
+    """``(file_name, bytes)`` of every file part of a multipart/form-data body."""
+    message = BytesParser(policy=HTTP).parsebytes(
+        b"Content-Type: " + content_type.encode("latin-1") + b"\r\n\r\n" + body
+    )
+    return [
+        (part.get_filename(), part.get_payload(decode=True))
+        for part in message.iter_parts() if part.get_filename()
+    ]
+
+
+class Handler(BaseHTTPRequestHandler):
+    service = None  # set by serve()
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):
+        if not self.server.quiet:
+            super().log_message(fmt, *args)
+
+    def send_json(self, status, payload, headers=()):
+        body = json.dumps(payload, default=str).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in headers:
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == "/health":
+            self.send_json(200, {"status": "ok"})
+        elif path == "/stats":
+            self.send_json(200, self.service.stats())
+        else:
+            self.send_json(404, {"error": f"No such endpoint: {path}"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.send_json(400, {"error": "Invalid Content-Length"})
+            self.close_connection = True
+            return
+        if length > MAX_BODY:
+            self.send_json(413, {"error": f"Upload over {MAX_BODY // 2**20} MB"})
+            self.close_connection = True
+            return
+        body = self.rfile.read(length)
+
+        reader = query.get("reader", DEFAULT_READER)
+        if reader not in READERS:
+            self.send_json(400, {"error": f"Unknown reader '{reader}' (choose from {', '.join(READERS)})"})
+            return
+        schemes = query.get("schemes", "0").lower() in ("1", "true", "yes")
+
+        if url.path == "/process":
+            name = query.get("name") or self.headers.get("X-File-Name")
+            if not name:
+                self.send_json(400, {"error": "Pass the file name as ?name= or an X-File-Name header"})
+                return
+            files = [(name, body)]
+        elif url.path == "/batch":
+            content_type = self.headers.get("Content-Type", "")
+            if not content_type.startswith("multipart/form-data"):
+                self.send_json(400, {"error": "Send the workbooks as multipart/form-data"})
+                return
+            files = multipart_files(content_type, body)
+            if not files:
+                self.send_json(400, {"error": "No file parts in the upload"})
+                return
+        else:
+            self.send_json(404, {"error": f"No such endpoint: {url.path}"})
+            return
+
+        if not self.service.admit(len(files)):
+            self.send_json(503, {"error": "Service busy; retry shortly"}, [("Retry-After", "1")])
+            return
+        start = time.perf_counter()
+        try:
+            results = self.service.run(files, reader, schemes)
+        except Exception as e:  # e.g. the replacement pool could not be started
+            self.send_json(500, {"error": format_error(e)})
+            return
+        elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+        if url.path == "/process":
+            payload, status = results[0], 200 if results[0]["ok"] else 422
+        else:
+            payload, status = {"files": results, "latency_ms": elapsed_ms}, 200
+        self.send_json(status, payload, [("X-Latency-Ms", str(elapsed_ms))])
+
+
+def serve(host, port, workers, queue, quiet=False):
+    service = Service(workers, queue)
+    service.warm_up()
+    handler = type("BoundHandler", (Handler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.quiet = quiet
+    return server, service
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the AMC processors over HTTP with a warm process pool.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes, i.e. files processed at once (default: %(default)s)")
+    parser.add_argument("--queue", type=int, default=32,
+                        help="Files allowed to wait for a worker before requests get 503 (default: %(default)s)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Don't log every request")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    server, service = serve(args.host, args.port, args.workers, args.queue, args.quiet)
+    print(f"Serving on http://{args.host}:{args.port} with {args.workers} warm worker(s)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.pool.shutdown(cancel_futures=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""Every AMC's SPEC against allocations pinned from the hand-written processors it replaced.
+
+The workbooks come from ``benchmarks.synthetic`` (200 rows, seed 0), so a
+spec edit or an engine change that moves any figure shows up here, under
+every workbook reader.
+"""
+import math
+
+import numpy as np
+import pytest
+from benchmarks.synthetic import LAYOUTS, make_workbook
+from utils.file_router import REGISTRY
+from utils.numbers import parse_numbers
+from utils.readers import READERS
+from utils.rules import run_spec
+
+EXPECTED = {
+    "adityabirla": {"Net Equity": -21.5716, "Hedged Equity": 88.2644, "International Equity": 53.7518,
+                    "Debt": 73.8496, "Gold": 1.2, "Silver": 0.8, "ReIT/InvIT": 7.2334, "Cash & Others": 1.0179},
+    "axis": {"Net Equity": 12.941, "Hedged Equity": 53.7518, "International Equity": 63.9833, "Debt": 73.8496,
+             "Gold": 1.0, "Silver": 0.5, "ReIT/InvIT": 5.0076, "Cash & Others": -53.373},
+    "baroda": {"Net Equity": 12.941, "Hedged Equity": 53.7518, "International Equity": 63.9833, "Debt": 73.8496,
+               "Gold": 1.0, "Silver": 0.5, "ReIT/InvIT": 5.0076, "Cash & Others": 0.3788},
+    "hdfc": {"Net Equity": 70.1, "Hedged Equity": 5.2, "International Equity": 6.0, "Debt": 13.9,
+             "Gold": 1.7, "Silver": 1.3, "ReIT/InvIT": 2.2, "Cash & Others": 3.3},
+    "hsbc": {"Net Equity": 66.6928, "Hedged Equity": 53.7518, "International Equity": 62.2029, "Debt": 142.782,
+             "Gold": 4.3105, "Silver": 1234.5, "ReIT/InvIT": 0.7679, "Cash & Others": 1.6},
+    "icici": {"Net Equity": 53.268, "Hedged Equity": 11.932, "International Equity": 4.1, "Debt": 14.4,
+              "Gold": 2.2, "Silver": 1.3, "Commodity Derivatives": 0.3, "ReIT/InvIT": 2.0, "Cash & Others": 2.1},
+    "mahindra": {"Net Equity": 66.6928, "Hedged Equity": -1.5, "International Equity": 53.7518, "Debt": 68.6544,
+                 "Gold": 1.25, "Silver": 0.75, "ReIT/InvIT": 4.6166, "Cash & Others": 2.2595},
+    "mirae": {"Net Equity": 65.1928, "Hedged Equity": 1.5, "International Equity": 53.7518, "Debt": 72.0568,
+              "Gold": 1.25, "Silver": 0.75, "ReIT/InvIT": 4.6166, "Cash & Others": 2.2595},
+    "shriram": {"Net Equity": 65.1928, "Hedged Equity": 1.5, "International Equity": 53.7518, "Debt": 72.0568,
+                "Gold": 1.25, "Silver": 0.75, "ReIT/InvIT": 4.6166, "Cash & Others": 2.2595},
+    "sundaram": {"Net Equity": 4.9353, "Hedged Equity": 61.7575, "International Equity": 72.2165, "Debt": 17.2119,
+                 "Gold": 1.1, "Silver": 0.6, "ReIT/InvIT": 4.1546, "Cash & Others": -0.4212},
+}
+
+
+@pytest.fixture(scope="module")
+def workbooks():
+    return {amc: make_workbook(amc, 200) for amc in LAYOUTS}
+
+
+@pytest.mark.parametrize("reader", list(READERS))
+@pytest.mark.parametrize("amc", sorted(EXPECTED))
+def test_spec_matches_pinned_allocations(workbooks, amc, reader):
+    key = next(k for k, path in REGISTRY.entries() if path == f"processors.{amc}")
+    result = run_spec(REGISTRY.module(key).SPEC, workbooks[amc], reader)
+    assert dict(result.items()) == pytest.approx(EXPECTED[amc], abs=1e-9)
+
+
+def test_parse_numbers_separators_signs_and_blanks():
+    column = [1234, 2.5, "1,234.5", " (2.5) ", "12.5%", "-3", "nil", "-", "NA", None, math.nan, "(3", "Total"]
+    values, valid = parse_numbers(column)
+    expected = [1234, 2.5, 1234.5, -2.5, 12.5, -3] + [math.nan] * 7
+    np.testing.assert_array_equal(values, np.array(expected, dtype=np.float64))
+    np.testing.assert_array_equal(valid, [True] * 6 + [False] * 7)
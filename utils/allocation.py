@@ -0,0 +1,63 @@
+"""Canonical allocation tags and the compact result every processor returns.
+
+AMC layouts name the same bucket differently ("Equity", "Net equity";
+"Cash", "Cash & others"; separate or combined ReIT / InvIT lines). Specs
+emit ``Tag`` members (``utils.tags``) and an ``AllocationResult`` holds one
+float per tag, NaN where the workbook had no such line. Results convert to
+a one-row frame, and many of them stack into one dense table (``stack``).
+"""
+import numpy as np
+import pandas as pd
+from utils.tags import LABELS, TAGS, Tag  # noqa: F401  (re-exported)
+
+
+class AllocationResult:
+    """One value per ``Tag`` in a float64 array; NaN marks a tag the workbook didn't report."""
+
+    __slots__ = ("values",)
+
+    def __init__(self, values=None):
+        self.values = np.full(len(TAGS), np.nan) if values is None else np.asarray(values, dtype=float)
+
+    @classmethod
+    def from_tags(cls, tags):
+        """From ``{Tag: value}``."""
+        result = cls()
+        for tag, value in tags.items():
+            result.values[tag] = value
+        return result
+
+    def __getitem__(self, tag):
+        return self.values[tag]
+
+    def __eq__(self, other):
+        return isinstance(other, AllocationResult) and np.array_equal(self.values, other.values, equal_nan=True)
+
+    def __repr__(self):
+        return "AllocationResult(" + ", ".join(f"{label}={value:g}" for label, value in self.items()) + ")"
+
+    def __getstate__(self):
+        return self.values
+
+    def __setstate__(self, values):
+        self.values = values
+
+    def items(self):
+        """``(label, value)`` of every reported tag, in ``Tag`` order."""
+        return [(LABELS[i], float(v)) for i, v in enumerate(self.values) if v == v]
+
+    def to_frame(self, name=None):
+        """One-row frame with a column per canonical tag."""
+        return pd.DataFrame([self.values], columns=LABELS, index=[name])
+
+    def tag_frame(self):
+        """The reported tags as a Tag / Final Value frame."""
+        items = self.items()
+        return pd.DataFrame({"Tag": [t for t, _ in items], "Final Value": [v for _, v in items]})
+
+
+def stack(results):
+    """Dense table of ``{name: AllocationResult}``: one row per name, one column per tag."""
+    names = list(results)
+    values = np.vstack([results[n].values for n in names]) if names else np.empty((0, len(TAGS)))
+    return pd.DataFrame(values, columns=LABELS, index=pd.Index(names, name="File"))
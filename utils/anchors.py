@@ -0,0 +1,64 @@
+import re
+from bisect import bisect_left
+
+
+class AnchorIndex:
+    """Lowercased view of a sheet's label column with one-pass keyword lookup.
+
+    Keywords passed up front are located in a single scan: a compiled
+    alternation rejects rows that contain none of them, and only the rows it
+    accepts are checked keyword by keyword. Keywords queried later are
+    resolved lazily with one extra scan and cached.
+    """
+
+    def __init__(self, labels, keywords=()):
+        self.labels = list(labels)
+        self.lower = [v.lower() if isinstance(v, str) else None for v in self.labels]
+        self.stripped = [v.strip() if v is not None else None for v in self.lower]
+        self._hits = {}
+        self._exact = {}
+        for pos, text in enumerate(self.stripped):
+            if text is not None:
+                self._exact.setdefault(text, []).append(pos)
+        self.register(keywords)
+
+    def __len__(self):
+        return len(self.lower)
+
+    def register(self, keywords):
+        pending = sorted({k.lower() for k in keywords} - self._hits.keys(), key=len, reverse=True)
+        if not pending:
+            return
+        for kw in pending:
+            self._hits[kw] = []
+        matcher = re.compile("|".join(map(re.escape, pending)))
+        for pos, text in enumerate(self.lower):
+            if text is None or not matcher.search(text):
+                continue
+            for kw in pending:
+                if kw in text:
+                    self._hits[kw].append(pos)
+
+    def positions(self, keyword, mode="contains", strip=False):
+        """Row positions whose label contains / starts with / equals ``keyword``.
+
+        ``exact`` compares against the stripped label; ``prefix`` uses the raw
+        lowercased label unless ``strip`` is set.
+        """
+        kw = keyword.lower()
+        if mode == "exact":
+            return self._exact.get(kw.strip(), [])
+        if kw not in self._hits:
+            self.register([kw])
+        hits = self._hits[kw]
+        if mode == "contains":
+            return hits
+        if mode == "prefix":
+            texts = self.stripped if strip else self.lower
+            return [pos for pos in hits if texts[pos].startswith(kw)]
+        raise ValueError(f"Unknown match mode: {mode}")
+
+    def first(self, keyword, mode="contains", start=0, strip=False):
+        hits = self.positions(keyword, mode, strip)
+        k = bisect_left(hits, start)
+        return hits[k] if k < len(hits) else None
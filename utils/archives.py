@@ -0,0 +1,79 @@
+"""Workbooks inside .zip bundles, read one member at a time.
+
+AMCs and data vendors ship a month's disclosures as a zip of ``.xlsx``
+files. Members are never extracted to disk: ``iter_members`` decompresses
+one member into memory, hands it over and moves on, and a member path
+(``<archive>.zip/<member>``) lets a batch worker read just its own member
+with ``read_source``.
+"""
+import os
+import posixpath
+import zipfile
+
+MAX_MEMBER = int(float(os.environ.get("MF_ZIP_MEMBER_MAX_MB", "200")) * 2**20)
+
+
+def is_archive(name):
+    return name.lower().endswith(".zip")
+
+
+def workbook_members(zf):
+    """``.xlsx`` members of an open zip, skipping folders, lock files and macOS metadata."""
+    names = []
+    for info in zf.infolist():
+        base = posixpath.basename(info.filename)
+        if (info.is_dir() or not base.lower().endswith(".xlsx") or base.startswith(("~$", "._"))
+                or info.filename.startswith("__MACOSX/")):
+            continue
+        names.append(info.filename)
+    return names
+
+
+def read_member(zf, member):
+    """Bytes of one member; raises ``ValueError`` for members over ``MAX_MEMBER`` uncompressed."""
+    size = zf.getinfo(member).file_size
+    if size > MAX_MEMBER:
+        raise ValueError(f"{member} is {size / 2**20:.0f} MB uncompressed (limit {MAX_MEMBER // 2**20} MB)")
+    return zf.read(member)
+
+
+def iter_members(source):
+    """``(member, bytes or exception)`` for every workbook in a zip path or binary file object, one at a time.
+
+    A member that can't be read yields its exception instead of stopping
+    the archive, so callers report it like any other failed file.
+    """
+    with zipfile.ZipFile(source) as zf:
+        for member in workbook_members(zf):
+            try:
+                yield member, read_member(zf, member)
+            except (ValueError, zipfile.BadZipFile, OSError, RuntimeError) as e:  # oversize, corrupt, encrypted
+                yield member, e
+
+
+def member_paths(archive):
+    """``<archive>/<member>`` for every workbook in the zip at ``archive``."""
+    with zipfile.ZipFile(archive) as zf:
+        return [archive + "/" + member for member in workbook_members(zf)]
+
+
+def split_member(path):
+    """``(archive, member)`` of a member path, or ``None`` for a plain file path."""
+    lower = path.lower()
+    pos = lower.find(".zip/")
+    while pos != -1:
+        archive = path[:pos + 4]
+        if os.path.isfile(archive):
+            return archive, path[pos + 5:]
+        pos = lower.find(".zip/", pos + 1)
+    return None
+
+
+def read_source(path):
+    """Bytes of a file or of one ``<archive>.zip/<member>``."""
+    parts = split_member(path)
+    if parts is None:
+        with open(path, "rb") as fh:
+            return fh.read()
+    with zipfile.ZipFile(parts[0]) as zf:
+        return read_member(zf, parts[1])
@@ -0,0 +1,105 @@
+import hashlib
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import threading
+
+# Bump when shared extraction code (utils.*) changes every processor's output
+SCHEMA = 3
+
+DEFAULT_DIR = os.environ.get("MF_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "mutualfund"))
+DEFAULT_MAX_BYTES = int(float(os.environ.get("MF_CACHE_MAX_MB", "256")) * 2**20)
+
+
+def processor_stamp(processor):
+    """``(name, version)`` of a processor function, from its module's ``VERSION``."""
+    module = sys.modules[processor.__module__]
+    return processor.__module__.rsplit(".", 1)[-1], getattr(module, "VERSION", 0)
+
+
+class ResultCache:
+    """Disk-backed, size-bounded LRU cache of processor results.
+
+    Entries live at ``<root>/<processor>/v<version>-s<schema>/<sha256>.pkl``,
+    keyed by the SHA-256 of the uploaded bytes. Hits refresh the file's mtime
+    and eviction drops the least recently used files once the cache grows
+    past ``max_bytes``. When a processor's ``VERSION`` changes, only that
+    processor's old entries are removed.
+    """
+
+    def __init__(self, root=DEFAULT_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._checked = set()
+        os.makedirs(root, exist_ok=True)
+
+    def key(self, file_bytes, processor, variant=""):
+        """Entry path for ``file_bytes``; ``variant`` separates other result shapes of the same upload."""
+        name, version = processor_stamp(processor)
+        bucket = os.path.join(self.root, name, f"v{version}-s{SCHEMA}")
+        if bucket not in self._checked:
+            self._drop_stale(bucket)
+        digest = hashlib.sha256(file_bytes).hexdigest()
+        return os.path.join(bucket, (f"{digest}-{variant}" if variant else digest) + ".pkl")
+
+    def _drop_stale(self, bucket):
+        parent, current = os.path.split(bucket)
+        if os.path.isdir(parent):
+            for entry in os.listdir(parent):
+                if entry != current:
+                    shutil.rmtree(os.path.join(parent, entry), ignore_errors=True)
+        os.makedirs(bucket, exist_ok=True)
+        self._checked.add(bucket)
+
+    def get(self, key):
+        try:
+            with open(key, "rb") as fh:
+                value = pickle.load(fh)
+            os.utime(key)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key, value):
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(key), suffix=".tmp")
+        with os.fdopen(fd, "wb") as fh:
+            pickle.dump(value, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, key)
+        self.evict()
+
+    def _entries(self):
+        for dirpath, _, files in os.walk(self.root):
+            for f in files:
+                if f.endswith(".pkl"):
+                    path = os.path.join(dirpath, f)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    yield st.st_mtime, st.st_size, path
+
+    def evict(self):
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+        os.makedirs(self.root, exist_ok=True)
+        self._checked.clear()
@@ -0,0 +1,80 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+import pandas as pd
+
+try:
+    import xlsxwriter
+except ImportError:  # optional faster writer
+    xlsxwriter = None
+
+ENGINES = ["openpyxl"] + (["xlsxwriter"] if xlsxwriter is not None else [])
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+_memo = OrderedDict()
+_memo_lock = threading.Lock()
+MEMO_ENTRIES = 32
+
+
+def frame_digest(df):
+    h = hashlib.sha256()
+    h.update(repr(list(df.columns)).encode())
+    h.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return h.hexdigest()
+
+
+def results_digest(sheets):
+    """Digest of an ordered ``{sheet_name: DataFrame}`` result set."""
+    h = hashlib.sha256()
+    for name, df in sheets.items():
+        h.update(name.encode())
+        h.update(frame_digest(df).encode())
+    return h.hexdigest()
+
+
+def _write_openpyxl(buf, sheets):
+    with pd.ExcelWriter(buf, engine="openpyxl") as writer:
+        for name, df in sheets.items():
+            df.to_excel(writer, sheet_name=name, index=False)
+
+
+def _write_xlsxwriter(buf, sheets):
+    # constant_memory flushes each row as it is written, so rows must go out in order;
+    # DataFrame.to_excel writes column by column and can't be used in this mode.
+    wb = xlsxwriter.Workbook(buf, {"constant_memory": True})
+    bold = wb.add_format({"bold": True})
+    for name, df in sheets.items():
+        ws = wb.add_worksheet(name)
+        ws.write_row(0, 0, [str(c) for c in df.columns], bold)
+        for r, row in enumerate(df.itertuples(index=False, name=None), start=1):
+            ws.write_row(r, 0, [None if pd.isna(v) else v for v in row])
+    wb.close()
+
+
+def build_workbook(sheets, engine="openpyxl"):
+    """Serialize ``{sheet_name: DataFrame}`` into .xlsx bytes."""
+    buf = BytesIO()
+    if engine == "xlsxwriter":
+        if xlsxwriter is None:
+            raise ImportError("xlsxwriter is not installed")
+        _write_xlsxwriter(buf, sheets)
+    else:
+        _write_openpyxl(buf, sheets)
+    return buf.getvalue()
+
+
+def cached_workbook(sheets, engine="openpyxl", digest=None):
+    """``build_workbook`` memoized on the result-set digest (and engine)."""
+    key = (digest or results_digest(sheets), engine)
+    with _memo_lock:
+        if key in _memo:
+            _memo.move_to_end(key)
+            return _memo[key]
+    data = build_workbook(sheets, engine)
+    with _memo_lock:
+        _memo[key] = data
+        while len(_memo) > MEMO_ENTRIES:
+            _memo.popitem(last=False)
+    return data
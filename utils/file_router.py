@@ -1,29 +1,175 @@
-from processors import (
-    adityabirla, axis, baroda, hdfc, hsbc,
-    icici, mahindra, mirae, shriram, sundaram
-)
-
-def get_processor(file_name: str):
-    name = file_name.lower()
-    if "birla" in name:
-        return adityabirla.process_adityabirla
-    elif "axis" in name:
-        return axis.process_axis
-    elif "baroda" in name:
-        return baroda.process_baroda
-    elif "hdfc" in name:
-        return hdfc.process_hdfc
-    elif "hsbc" in name:
-        return hsbc.process_hsbc
-    elif "icici" in name:
-        return icici.process_icici
-    elif "mahindra" in name:
-        return mahindra.process_mahindra
-    elif "mirae" in name:
-        return mirae.process_mirae
-    elif "shriram" in name:
-        return shriram.process_shriram
-    elif "sundaram" in name:
-        return sundaram.process_sundaram
-    else:
-        raise ValueError("Unknown fund in file name: " + file_name)
+"""Routing of uploads to AMC processors, loading processor modules on first use.
+
+Processors are registered by import path: the built-in AMCs below and any
+module an installed package advertises in the ``mutualfund.processors``
+entry-point group, e.g. in its ``pyproject.toml``::
+
+    [project.entry-points."mutualfund.processors"]
+    quantum = "mf_quantum.processor"
+
+The entry-point name is the file-name substring that identifies the AMC
+and its value must be a plain module path; the ``module:attr`` form is
+rejected (recorded in ``REGISTRY.errors``) because routing, caching and
+history need the module's ``SPEC`` and ``VERSION``, not one function.
+The module follows the built-ins' layout: ``SPEC``, ``MARKERS``, ``VERSION``
+and a ``process_<module name>(file_bytes, reader=None)`` function (or just
+``process``). Processor
+modules import only ``utils.tags`` at load time and ``utils.rules`` (pandas,
+openpyxl) inside their function, so routing by signature stays cheap and
+the heavy imports are paid once, by the first file actually processed.
+"""
+import importlib
+import posixpath
+from importlib.metadata import entry_points
+
+from utils.fingerprint import FINGERPRINT_ERRORS, workbook_fingerprint
+
+ENTRY_POINT_GROUP = "mutualfund.processors"
+
+# File-name substring -> processor module, checked in order (plugins after these)
+BUILTIN = [
+    ("birla", "processors.adityabirla"),
+    ("axis", "processors.axis"),
+    ("baroda", "processors.baroda"),
+    ("hdfc", "processors.hdfc"),
+    ("hsbc", "processors.hsbc"),
+    ("icici", "processors.icici"),
+    ("mahindra", "processors.mahindra"),
+    ("mirae", "processors.mirae"),
+    ("shriram", "processors.shriram"),
+    ("sundaram", "processors.sundaram"),
+]
+
+
+class Registry:
+    """Fund keys -> processor module paths; modules are imported on first lookup."""
+
+    def __init__(self, entries=BUILTIN, group=ENTRY_POINT_GROUP):
+        self._entries = list(entries)
+        self._group = group
+        self._discovered = group is None
+        self._modules = {}
+        self.errors = {}
+
+    def register(self, key, path):
+        """Add (or, for an existing key, replace) a processor module path."""
+        self._entries = [(k, p) for k, p in self._entries if k != key] + [(key, path)]
+        self._modules.pop(key, None)
+
+    def _discover(self):
+        if self._discovered:
+            return
+        self._discovered = True
+        known = {key for key, _ in self._entries}
+        for ep in entry_points(group=self._group):
+            if ep.name in known:
+                continue
+            if ep.attr:
+                self.errors[ep.name] = f"{ep.value}: entry points must name a module, not 'module:attr'"
+                continue
+            self._entries.append((ep.name, ep.value))
+
+    def entries(self):
+        """``(key, module path)`` of every processor, built-ins first."""
+        self._discover()
+        return list(self._entries)
+
+    def module(self, key):
+        if key not in self._modules:
+            path = dict(self.entries())[key]
+            self._modules[key] = importlib.import_module(path)
+        return self._modules[key]
+
+    def modules(self):
+        """Every processor module that imports; a broken plugin is recorded in ``errors`` and skipped."""
+        loaded = []
+        for key, path in self.entries():
+            try:
+                loaded.append(self.module(key))
+            except Exception as e:
+                self.errors[key] = f"{path}: {type(e).__name__}: {e}"
+        return loaded
+
+
+REGISTRY = Registry()
+
+
+def module_name(module):
+    return module.__name__.rsplit(".", 1)[-1]
+
+
+def entry_point(module):
+    return getattr(module, "process_" + module_name(module), None) or module.process
+
+
+def required_sheet(module):
+    sheet = module.SPEC.get("sheet")
+    return sheet if isinstance(sheet, str) else None
+
+
+def name_key(file_name):
+    """Registry key the file name matches, or ``None``; uploads sharing content and key route alike.
+
+    Only the last path component counts, so a zip member is routed by its
+    own name, not the archive's.
+    """
+    name = posixpath.basename(file_name).lower()
+    for key, _ in REGISTRY.entries():
+        if key in name:
+            return key
+    return None
+
+
+def route_by_name(file_name):
+    key = name_key(file_name)
+    return REGISTRY.module(key) if key is not None else None
+
+
+def route_by_content(file_bytes):
+    """Signature score per processor module, or ``None`` if the bytes aren't an .xlsx.
+
+    A module whose layout needs a named sheet scores 2 when the workbook has
+    it and is left out when it doesn't; each of its ``MARKERS`` found among
+    the leading shared strings adds 1.
+    """
+    try:
+        sheets, strings = workbook_fingerprint(file_bytes)
+    except FINGERPRINT_ERRORS:
+        return None
+    text = "\n".join(strings)
+    scores = {}
+    for module in REGISTRY.modules():
+        sheet = required_sheet(module)
+        if sheet and sheet not in sheets:
+            continue
+        scores[module] = (2 if sheet else 0) + sum(marker in text for marker in module.MARKERS)
+    return scores
+
+
+def get_processor(file_name: str, file_bytes=None):
+    """Processor for an upload, by workbook signature when ``file_bytes`` is given.
+
+    The file name decides whenever its processor scores as well as any other,
+    so content only overrides a name that is missing or contradicted.
+    """
+    named = route_by_name(file_name)
+    scores = route_by_content(file_bytes) if file_bytes is not None else None
+    if scores is None:
+        if named is None:
+            raise ValueError("Unknown fund in file name: " + file_name)
+        return entry_point(named)
+
+    best = max(scores.values(), default=0)
+    top = [m for m, s in scores.items() if s == best]
+    if named in top:
+        return entry_point(named)
+    if best > 0 and len(top) == 1:
+        return entry_point(top[0])
+    if best > 0:
+        raise ValueError(
+            f"Ambiguous workbook {file_name}: matches "
+            + ", ".join(module_name(m) for m in top)
+        )
+    if named is not None:
+        raise ValueError(f"{file_name} looks like {module_name(named)} but has no '{required_sheet(named)}' sheet")
+    raise ValueError("Unknown fund in file name: " + file_name)
@@ -0,0 +1,87 @@
+import posixpath
+import zipfile
+from io import BytesIO
+from xml.etree.ElementTree import ParseError, iterparse
+
+# Titles and headings sit at the top of a factsheet, so only the first
+# strings are looked at
+STRINGS_LIMIT = 200
+
+FINGERPRINT_ERRORS = (zipfile.BadZipFile, KeyError, ParseError)
+
+REL_ID = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def _text(el):
+    return "".join(t.text or "" for t in el.iter() if _local(t.tag) == "t").lower()
+
+
+def _first_sheet_part(zf, rel_id):
+    with zf.open("xl/_rels/workbook.xml.rels") as fh:
+        for _, el in iterparse(fh):
+            if _local(el.tag) == "Relationship" and el.get("Id") == rel_id:
+                target = el.get("Target")
+                if target.startswith("/"):
+                    return target.lstrip("/")
+                return posixpath.normpath(posixpath.join("xl", target))
+    raise KeyError(rel_id)
+
+
+def _shared_strings(fh, limit):
+    strings = []
+    for _, el in iterparse(fh):
+        if _local(el.tag) == "si":
+            strings.append(_text(el))
+            el.clear()
+            if len(strings) >= limit:
+                break
+    return strings
+
+
+def _inline_strings(fh, limit):
+    # Workbooks written in streaming mode (openpyxl write_only, xlsxwriter
+    # constant_memory) keep strings inline in the sheet instead
+    strings = []
+    for _, el in iterparse(fh):
+        if _local(el.tag) == "is":
+            strings.append(_text(el))
+            if len(strings) >= limit:
+                break
+        elif _local(el.tag) == "row":
+            el.clear()
+    return strings
+
+
+def sheet_names(file_bytes):
+    """Sheet names of an .xlsx in workbook order, read from ``xl/workbook.xml`` alone."""
+    with zipfile.ZipFile(BytesIO(file_bytes)) as zf:
+        with zf.open("xl/workbook.xml") as fh:
+            return [el.get("name") for _, el in iterparse(fh) if _local(el.tag) == "sheet"]
+
+
+def workbook_fingerprint(file_bytes, limit=STRINGS_LIMIT):
+    """``(sheet_names, strings)`` of an .xlsx without loading any worksheet.
+
+    Sheet names come from ``xl/workbook.xml``; ``strings`` are the first
+    ``limit`` entries of ``xl/sharedStrings.xml`` (or, without one, the first
+    inline strings of the first sheet), lowercased and parsed incrementally
+    from the zip member. Raises one of ``FINGERPRINT_ERRORS`` if the bytes
+    are not an .xlsx workbook.
+    """
+    with zipfile.ZipFile(BytesIO(file_bytes)) as zf:
+        with zf.open("xl/workbook.xml") as fh:
+            sheets = [el for _, el in iterparse(fh) if _local(el.tag) == "sheet"]
+        names = [el.get("name") for el in sheets]
+        if "xl/sharedStrings.xml" in zf.namelist():
+            with zf.open("xl/sharedStrings.xml") as fh:
+                strings = _shared_strings(fh, limit)
+        elif sheets:
+            with zf.open(_first_sheet_part(zf, sheets[0].get(REL_ID))) as fh:
+                strings = _inline_strings(fh, limit)
+        else:
+            strings = []
+    return names, strings
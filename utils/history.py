@@ -0,0 +1,197 @@
+"""Persistent allocation history in a local SQLite database.
+
+Every ingested file is recorded once by the SHA-256 of its bytes, with its
+AMC and disclosure month. Its allocations are stored one row per
+(AMC, scheme, month, file, tag). Ingest is incremental: files whose hash is
+already stored are skipped before any processing, so a back-history is
+loaded once and later runs only pay for new disclosures.
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import sys
+from contextlib import closing
+from datetime import datetime, timezone
+
+import pandas as pd
+from utils.cache import processor_stamp
+from utils.fingerprint import FINGERPRINT_ERRORS, workbook_fingerprint
+from utils.schemes import fund_sheet, scheme_rows
+
+DEFAULT_PATH = os.environ.get(
+    "MF_HISTORY_DB", os.path.join(os.path.expanduser("~"), ".local", "share", "mutualfund", "history.sqlite")
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    file_hash TEXT PRIMARY KEY,
+    file_name TEXT NOT NULL,
+    amc TEXT NOT NULL,
+    month TEXT NOT NULL,
+    processor_version INTEGER NOT NULL,
+    ingested_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS allocations (
+    amc TEXT NOT NULL,
+    scheme TEXT NOT NULL,
+    month TEXT NOT NULL,
+    file_hash TEXT NOT NULL REFERENCES files(file_hash) ON DELETE CASCADE,
+    tag TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (amc, scheme, month, file_hash, tag)
+);
+CREATE INDEX IF NOT EXISTS allocations_month ON allocations (month, amc);
+CREATE INDEX IF NOT EXISTS allocations_file ON allocations (file_hash);
+CREATE INDEX IF NOT EXISTS files_amc_month ON files (amc, month);
+"""
+
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+MONTH_NAME = re.compile(
+    r"(?<![a-z])(january|february|march|april|may|june|july|august|september|october|november|december"
+    r"|jan|feb|mar|apr|jun|jul|aug|sept|sep|oct|nov|dec)(?![a-z])[\s\-_'.,]*"
+    r"(?:\d{1,2}(?:st|nd|rd|th)?[\s,]+)?(\d{4}|\d{2})(?!\d)"
+)
+YEAR_MONTH = re.compile(r"(?<!\d)(20\d{2})[-_.](0[1-9]|1[0-2])(?!\d)")
+DAY_MONTH_YEAR = re.compile(r"(?<!\d)(\d{1,2})[-/.](\d{1,2})[-/.](20\d{2})(?!\d)")
+
+
+def file_hash(file_bytes):
+    return hashlib.sha256(file_bytes).hexdigest()
+
+
+def month_in(text):
+    """``"YYYY-MM"`` of the first date-like mention in ``text``, or ``None``."""
+    text = text.lower()
+    m = MONTH_NAME.search(text)
+    if m:
+        year = int(m.group(2))
+        return f"{year + 2000 if year < 100 else year:04d}-{MONTHS[m.group(1)[:3]]:02d}"
+    m = YEAR_MONTH.search(text)
+    if m:
+        return f"{m.group(1)}-{m.group(2)}"
+    m = DAY_MONTH_YEAR.search(text)
+    if m and 1 <= int(m.group(2)) <= 12:
+        return f"{m.group(3)}-{int(m.group(2)):02d}"
+    return None
+
+
+def disclosure_month(file_name, file_bytes=None):
+    """Disclosure month of an upload.
+
+    Taken from the file name, else the leading workbook strings, else the
+    folders of ``file_name`` when it is a path (innermost first), as in
+    ``factsheets/2024-03/icici.xlsx``.
+    """
+    *folders, base = re.split(r"[\\/]", file_name)
+    month = month_in(os.path.splitext(base)[0])
+    if month:
+        return month
+    if file_bytes is not None:
+        try:
+            _, strings = workbook_fingerprint(file_bytes)
+        except FINGERPRINT_ERRORS:
+            strings = []
+        for text in strings:
+            month = month_in(text)
+            if month:
+                return month
+    for folder in reversed(folders):
+        month = month_in(folder)
+        if month:
+            return month
+    return None
+
+
+def allocation_rows(result, scheme):
+    """``(scheme, tag, value)`` rows of an ``AllocationResult`` (for ``scheme``) or a ``utils.schemes`` table."""
+    if isinstance(result, pd.DataFrame):
+        return scheme_rows(result)
+    return [(scheme, tag, value) for tag, value in result.items()]
+
+
+class HistoryStore:
+    """Allocation history database at ``path`` (see module docstring).
+
+    A connection is opened per call, so one store can be shared between
+    threads (e.g. Streamlit script runs).
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with closing(self._connect()) as con:
+            con.executescript(SCHEMA)
+
+    def _connect(self):
+        con = sqlite3.connect(self.path, timeout=30)
+        con.execute("PRAGMA foreign_keys = ON")
+        con.execute("PRAGMA journal_mode = WAL")
+        return con
+
+    def has(self, digest):
+        with closing(self._connect()) as con:
+            return con.execute("SELECT 1 FROM files WHERE file_hash = ?", (digest,)).fetchone() is not None
+
+    def ingest(self, digest, file_name, amc, month, rows, processor_version=0):
+        """Store one file's ``(scheme, tag, value)`` rows; returns False if its hash was already stored."""
+        with closing(self._connect()) as con, con:
+            cur = con.execute(
+                "INSERT OR IGNORE INTO files VALUES (?, ?, ?, ?, ?, ?)",
+                (digest, file_name, amc, month, processor_version,
+                 datetime.now(timezone.utc).isoformat(timespec="seconds")),
+            )
+            if cur.rowcount == 0:
+                return False
+            con.executemany(
+                "INSERT OR REPLACE INTO allocations VALUES (?, ?, ?, ?, ?, ?)",
+                [(amc, scheme, month, digest, tag, value) for scheme, tag, value in rows],
+            )
+        return True
+
+    def allocations(self, amc=None, scheme=None, since=None, until=None):
+        """Long-form allocations (AMC, Scheme, Month, Tag, Value, File), optionally filtered."""
+        where, params = [], []
+        for column, op, value in (("a.amc", "=", amc), ("a.scheme", "=", scheme),
+                                  ("a.month", ">=", since), ("a.month", "<=", until)):
+            if value is not None:
+                where.append(f"{column} {op} ?")
+                params.append(value)
+        sql = (
+            "SELECT a.amc AS AMC, a.scheme AS Scheme, a.month AS Month, a.tag AS Tag, a.value AS Value, "
+            "f.file_name AS File FROM allocations a JOIN files f USING (file_hash)"
+            + (" WHERE " + " AND ".join(where) if where else "")
+            + " ORDER BY a.amc, a.scheme, a.month, f.ingested_at, a.rowid"
+        )
+        with closing(self._connect()) as con:
+            return pd.read_sql_query(sql, con, params=params)
+
+    def files(self):
+        with closing(self._connect()) as con:
+            return pd.read_sql_query(
+                "SELECT file_name AS File, amc AS AMC, month AS Month, processor_version AS Version, "
+                "ingested_at AS Ingested, file_hash AS Hash FROM files ORDER BY amc, month", con,
+            )
+
+
+def ingest_upload(store, file_name, file_bytes, result, processor, month=None, digest=None, path=None):
+    """Store a processed upload; returns ``(stored, message)``.
+
+    ``result`` is the processor's ``AllocationResult`` or a ``utils.schemes`` table. The month is
+    taken from the file name, workbook or folders of ``path`` (default ``file_name``) unless given.
+    """
+    digest = digest or file_hash(file_bytes)
+    if store.has(digest):
+        return False, "already in history"
+    month = month or disclosure_month(path or file_name, file_bytes)
+    if month is None:
+        return False, "disclosure month not found in the file name, workbook or folders"
+    amc, version = processor_stamp(processor)
+    scheme = None if isinstance(result, pd.DataFrame) else fund_sheet(sys.modules[processor.__module__].SPEC, file_bytes)
+    rows = allocation_rows(result, scheme)
+    if not store.ingest(digest, file_name, amc, month, rows, version):
+        return False, "already in history"
+    return True, f"{amc} {month}: {len(rows)} value(s)"
@@ -0,0 +1,98 @@
+"""Background processing jobs that outlive a Streamlit script run.
+
+A ``JobQueue`` owns a few dispatcher threads. Each submitted upload becomes
+a ``Job`` whose status moves queued -> running -> done / failed while the
+script keeps rerunning; the page only reads job state. A job runs through
+``iter_results``, so routing, the result cache, the process pool and stage
+timings behave exactly as for a synchronous run.
+"""
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.runner import format_error, iter_results
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+class Job:
+    def __init__(self, job_id, file_name, key):
+        self.id = job_id
+        self.file_name = file_name
+        self.key = key
+        self.status = QUEUED
+        self.df = None
+        self.error = None
+        self.stages = []
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.future = None
+
+    @property
+    def pending(self):
+        return self.status in (QUEUED, RUNNING)
+
+    @property
+    def seconds(self):
+        """Run time so far (or in total, once finished)."""
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+
+class JobQueue:
+    """Runs uploads in background threads, one job per distinct key.
+
+    ``dispatchers`` bounds how many jobs run at once; with a process pool
+    passed as ``executor`` each running job waits on a worker, so match it to
+    the pool size. Submitting a key that already has a job returns that job,
+    so a script rerun never restarts earlier work.
+    """
+
+    def __init__(self, dispatchers=4):
+        self._threads = ThreadPoolExecutor(max_workers=dispatchers, thread_name_prefix="mf-job")
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._ids = itertools.count(1)
+
+    def submit(self, file_name, file_bytes, key=None, **options):
+        """Queue ``file_name`` unless ``key`` already has a job; ``options`` go to ``iter_results``.
+
+        ``file_bytes`` may also be a handle with ``read()`` (e.g. a
+        ``utils.uploads.Upload``), which is only read once the job starts.
+        """
+        key = file_name if key is None else key
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None:
+                return job
+            job = self._jobs[key] = Job(next(self._ids), file_name, key)
+        job.future = self._threads.submit(self._run, job, file_bytes, options)
+        return job
+
+    def _run(self, job, file_bytes, options):
+        job.started = time.time()
+        job.status = RUNNING
+        try:
+            if hasattr(file_bytes, "read"):
+                file_bytes = file_bytes.read()
+            for _, df, err, stages in iter_results([(job.file_name, file_bytes)], **options):
+                job.df, job.error, job.stages = df, err, stages
+        except Exception as e:  # e.g. the pool broke while submitting
+            job.error = format_error(e)
+        job.finished = time.time()
+        job.status = DONE if job.error is None else FAILED
+
+    def clear(self):
+        """Forget every job; queued ones are cancelled, running ones finish unobserved."""
+        with self._lock:
+            jobs, self._jobs = self._jobs, {}
+        for job in jobs.values():
+            if job.future is not None:
+                job.future.cancel()
+
+    def shutdown(self):
+        self.clear()
+        self._threads.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,131 @@
+"""Blended asset-class exposure of many portfolios across many funds.
+
+A fund matrix has one row per fund (or scheme) and one column per canonical
+tag (``utils.allocation.LABELS``), with unreported tags as 0. Holdings are a
+portfolios x funds matrix of amounts. The look-through of every portfolio is
+then a single product, ``weights @ funds``, where each portfolio's weights
+are its amounts divided by its total.
+
+Holdings come in long form: Portfolio, Fund, and either Amount or Units and
+NAV (amount = units x NAV). A fund is named by its file name (the path
+relative to the inputs for ``batch.py`` output), or ``"<file> / <scheme>"``
+for the rows of a scheme table.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+from utils.allocation import LABELS, AllocationResult
+from utils.schemes import ISSUE_COLUMN, SCHEME_COLUMN
+
+PORTFOLIO_COLUMN = "Portfolio"
+FUND_COLUMN = "Fund"
+AMOUNT_COLUMN = "Amount"
+TOTAL_COLUMN = "Total"
+
+
+def fund_name(name, scheme=None):
+    return name if scheme is None else f"{name} / {scheme}"
+
+
+def fund_matrix(results):
+    """Funds x tags matrix of ``{name: AllocationResult or scheme table}``."""
+    names, rows = [], []
+    for name, result in results.items():
+        if isinstance(result, AllocationResult):
+            names.append(fund_name(name))
+            rows.append(result.values)
+            continue
+        table = result[result[ISSUE_COLUMN].isna()]
+        names.extend(fund_name(name, scheme) for scheme in table[SCHEME_COLUMN])
+        rows.extend(table[LABELS].to_numpy(float))
+    values = np.nan_to_num(np.vstack(rows)) if rows else np.empty((0, len(LABELS)))
+    return pd.DataFrame(values, columns=LABELS, index=pd.Index(names, name=FUND_COLUMN))
+
+
+def long_matrix(long_df, keys):
+    """Funds x tags matrix of long-form rows (``Tag``, ``Value``), a fund per distinct ``keys``.
+
+    Takes the batch CLI's output (keys File[, Scheme]) or history allocations
+    (keys AMC, Scheme). A fund with more than one row for a tag (e.g. two
+    months, or two files of the same name) raises ``ValueError``.
+    """
+    names = long_df[keys[0]].astype(str)
+    for key in keys[1:]:
+        names = names + " / " + long_df[key].astype(str)
+    repeated = pd.DataFrame({FUND_COLUMN: names, "Tag": long_df["Tag"]}).duplicated(keep=False)
+    if repeated.any():
+        funds = sorted(set(names[repeated]))
+        raise ValueError(
+            f"{len(funds)} fund(s) have more than one row for a tag: {', '.join(funds[:5])}"
+            + (" ..." if len(funds) > 5 else "")
+        )
+    matrix = (
+        long_df.assign(**{FUND_COLUMN: names})
+        .pivot_table(index=FUND_COLUMN, columns="Tag", values="Value", aggfunc="first", sort=False)
+        .reindex(columns=LABELS)
+        .fillna(0.0)
+    )
+    matrix.columns.name = None
+    return matrix
+
+
+def history_matrix(store, month=None):
+    """Funds (``"<AMC> / <scheme>"``) x tags from an allocation history: ``month``, else each scheme's latest."""
+    rows = store.allocations(since=month, until=month)
+    if month is None and not rows.empty:
+        latest = rows.groupby(["AMC", "Scheme"])["Month"].transform("max")
+        rows = rows[rows["Month"] == latest]
+    return long_matrix(rows, ["AMC", "Scheme"])
+
+
+def holding_amounts(holdings):
+    """Amount of each long-form holdings row (``Amount``, else ``Units`` x ``NAV``)."""
+    if AMOUNT_COLUMN in holdings:
+        return holdings[AMOUNT_COLUMN].to_numpy(float)
+    if "Units" in holdings and "NAV" in holdings:
+        return holdings["Units"].to_numpy(float) * holdings["NAV"].to_numpy(float)
+    raise ValueError(f"Holdings need an {AMOUNT_COLUMN} column, or Units and NAV columns")
+
+
+def holdings_matrix(holdings, funds):
+    """``(portfolios, amounts)``: a portfolios x ``funds`` array of long-form ``holdings``.
+
+    Raises ``KeyError`` naming any fund that isn't in ``funds``.
+    """
+    fund_index = pd.Index(funds)
+    codes = fund_index.get_indexer(holdings[FUND_COLUMN].astype(str))
+    if (codes < 0).any():
+        missing = sorted(set(holdings[FUND_COLUMN].astype(str)[codes < 0]))
+        raise KeyError(f"No allocations for fund(s): {', '.join(missing)}")
+    portfolio_codes, portfolios = pd.factorize(holdings[PORTFOLIO_COLUMN], sort=False)
+    amounts = np.zeros((len(portfolios), len(fund_index)))
+    np.add.at(amounts, (portfolio_codes, codes), holding_amounts(holdings))
+    return pd.Index(portfolios, name=PORTFOLIO_COLUMN), amounts
+
+
+def look_through(funds, holdings):
+    """Blended exposure per portfolio: one row per portfolio, a column per tag and its ``Total`` amount.
+
+    ``funds`` is a fund matrix (``fund_matrix``, ``long_matrix`` or
+    ``history_matrix``) and ``holdings`` long-form rows or a portfolios x
+    funds frame of amounts. Exposures are in the funds' own units (percent
+    of net assets for AMC disclosures); portfolios with no holdings are NaN.
+    """
+    if PORTFOLIO_COLUMN in holdings:
+        portfolios, amounts = holdings_matrix(holdings, funds.index)
+    else:
+        portfolios, amounts = holdings.index, holdings.reindex(columns=funds.index, fill_value=0.0).to_numpy(float)
+    totals = amounts.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weights = amounts / totals[:, None]
+    exposure = pd.DataFrame(weights @ funds.to_numpy(float), index=portfolios, columns=LABELS)
+    exposure[TOTAL_COLUMN] = totals
+    return exposure
+
+
+def read_holdings(source):
+    """Long-form holdings from a CSV or Parquet path or named file object (e.g. an upload)."""
+    if os.path.splitext(getattr(source, "name", source))[1].lower() == ".parquet":
+        return pd.read_parquet(source)
+    return pd.read_csv(source)
@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+# An optionally parenthesised (negative) number with thousand separators and a trailing "%"
+NUMBER = r"^\s*(\()?\s*([-+]?(?:\d[\d,]*(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?)\s*%?\s*(\))?\s*$"
+# Columns ``infer_dtype`` reports with no text at all
+NUMERIC_KINDS = {"empty", "floating", "integer", "mixed-integer-float", "boolean", "decimal"}
+
+
+def parse_numbers(column):
+    """``(values, valid)`` of a sheet column: float64 values (NaN where invalid) and the validity mask.
+
+    Numeric cells are converted in one ``pd.to_numeric`` pass and text cells
+    in one regex pass (``NUMBER``), where thousand separators, spaces and "%"
+    are dropped and "(1.23)" reads as -1.23. Blanks, dates and text without
+    a number ("nil", "NA", "-", labels) are invalid.
+    """
+    column = np.asarray(column, dtype=object)
+    cells = pd.Series(column, dtype=object)
+    if pd.api.types.infer_dtype(cells, skipna=True) in NUMERIC_KINDS:
+        values = np.array(pd.to_numeric(cells, errors="coerce"), dtype=np.float64)
+        return values, ~np.isnan(values)
+    is_text = np.fromiter((isinstance(v, str) for v in column), dtype=bool, count=len(column))
+    values = np.array(pd.to_numeric(cells.mask(is_text), errors="coerce"), dtype=np.float64)
+    if is_text.any():
+        parts = cells[is_text].str.extract(NUMBER)
+        parsed = pd.to_numeric(parts[1].str.replace(",", "", regex=False), errors="coerce").to_numpy(np.float64)
+        opened, closed = parts[0].notna().to_numpy(), parts[2].notna().to_numpy()
+        values[is_text] = np.where(opened != closed, np.nan, np.where(opened, -parsed, parsed))
+    return values, ~np.isnan(values)
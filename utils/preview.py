@@ -0,0 +1,43 @@
+"""Result previews that cost the same however many files a session holds.
+
+A preview shows one page of one result: ``page`` slices the frame on the
+server, so the browser only ever receives ``size`` rows. ``overview`` is the
+one table that covers every file, built in a single vectorized pass per
+result set (one row per file, a column per tag for fund results).
+"""
+import math
+
+import pandas as pd
+from utils.allocation import AllocationResult, stack
+
+PAGE_SIZES = [25, 100, 500]
+
+
+def as_frame(result):
+    """Displayable frame of a result: Tag / Final Value rows, or the scheme table as-is."""
+    return result.tag_frame() if isinstance(result, AllocationResult) else result
+
+
+def page_count(rows, size):
+    return max(1, math.ceil(rows / size))
+
+
+def page(df, number, size):
+    """``(rows, start, stop)``: page ``number`` (1-based, clamped) of ``df``."""
+    number = min(max(1, number), page_count(len(df), size))
+    start = (number - 1) * size
+    stop = min(start + size, len(df))
+    return df.iloc[start:stop], start, stop
+
+
+def overview(results):
+    """One row per file of ``{name: AllocationResult or scheme table}``: kind, rows and fund values."""
+    single = {n: r for n, r in results.items() if isinstance(r, AllocationResult)}
+    table = stack(single).reindex(pd.Index(list(results), name="File"))
+    rows = table.notna().sum(axis=1)
+    for name, result in results.items():
+        if name not in single:
+            rows[name] = len(result)
+    table.insert(0, "Rows", rows)
+    table.insert(0, "Result", ["fund" if n in single else "schemes" for n in results])
+    return table.reset_index()
@@ -0,0 +1,146 @@
+import json
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows: no RSS figure
+    resource = None
+
+STAGES = ["routing", "cache", "open", "parse", "extract", "export"]
+
+_active = ContextVar("stage_timer", default=None)
+# tracemalloc is process-wide: traced stages of concurrent jobs take turns
+_trace_lock = threading.RLock()
+
+
+def rss_peak_mb():
+    """High-water mark of this process's resident set size, in MB (``None`` without ``resource``)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+class StageTimer:
+    """Wall time and memory of the named stages of one file's run.
+
+    Each record holds the stage name, its wall time, the process RSS
+    high-water mark when it ended (where ``resource`` exists) and, with ``trace_memory``, the peak
+    tracemalloc allocation of the whole process during the stage (slower;
+    off by default). Tracing is started once per process and left on, and
+    traced stages in different threads run one at a time so none resets
+    another's peak.
+    """
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.records = []
+
+    @contextmanager
+    def active(self):
+        """Make this the timer ``stage()`` records into, for the current context."""
+        token = _active.set(self)
+        try:
+            yield self
+        finally:
+            _active.reset(token)
+
+    @contextmanager
+    def stage(self, name):
+        if not self.trace_memory:
+            start = time.perf_counter()
+            try:
+                yield
+            finally:
+                self.records.append(self._record(name, start))
+            return
+        with _trace_lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            start = time.perf_counter()
+            try:
+                yield
+            finally:
+                record = self._record(name, start)
+                record["traced_peak_mb"] = tracemalloc.get_traced_memory()[1] / 2**20
+                self.records.append(record)
+
+    @staticmethod
+    def _record(name, start):
+        record = {"stage": name, "seconds": time.perf_counter() - start}
+        rss = rss_peak_mb()
+        if rss is not None:
+            record["rss_peak_mb"] = rss
+        return record
+
+
+@contextmanager
+def stage(name):
+    """Time a stage on the active ``StageTimer``; does nothing without one."""
+    timer = _active.get()
+    if timer is None:
+        yield
+    else:
+        with timer.stage(name):
+            yield
+
+
+def add_records(records):
+    """Append stage records measured elsewhere (e.g. in a worker) to the active timer."""
+    timer = _active.get()
+    if timer is not None:
+        timer.records.extend(records)
+
+
+def stage_table(timings):
+    """One row per file of ``{file_name: records}``: seconds per stage, total and memory peaks."""
+    rows = []
+    for file_name, records in timings.items():
+        row = {"File": file_name}
+        for r in records:
+            row[r["stage"]] = row.get(r["stage"], 0.0) + r["seconds"]
+        row["Total s"] = sum(r["seconds"] for r in records)
+        rss = [r["rss_peak_mb"] for r in records if "rss_peak_mb" in r]
+        if rss:
+            row["Peak RSS MB"] = max(rss)
+        traced = [r["traced_peak_mb"] for r in records if "traced_peak_mb" in r]
+        if traced:
+            row["Traced process peak MB"] = max(traced)
+        rows.append(row)
+    df = pd.DataFrame(rows)
+    columns = ["File"] + [s for s in STAGES if s in df] + [c for c in ("Total s", "Peak RSS MB", "Traced process peak MB") if c in df]
+    return df[columns] if rows else df
+
+
+def stage_summary(timings):
+    """Per stage over all files: total, mean and max seconds, and the slowest file."""
+    rows = [
+        {"File": file_name, "Stage": r["stage"], "Seconds": r["seconds"]}
+        for file_name, records in timings.items() for r in records
+    ]
+    if not rows:
+        return pd.DataFrame(columns=["Stage", "Files", "Total s", "Mean s", "Max s", "Slowest file"])
+    df = pd.DataFrame(rows)
+    slowest = df.loc[df.groupby("Stage")["Seconds"].idxmax()].set_index("Stage")["File"]
+    summary = df.groupby("Stage")["Seconds"].agg(Files="count", **{"Total s": "sum", "Mean s": "mean", "Max s": "max"})
+    summary["Slowest file"] = slowest
+    order = [s for s in STAGES if s in summary.index]
+    return summary.loc[order].reset_index()
+
+
+def timings_json(meta, timings, exports=None):
+    """JSON document of a batch run: ``meta`` plus the stage records of every file."""
+    files = {name: {"stages": records} for name, records in timings.items()}
+    for label, records in (exports or {}).items():
+        entry = files.setdefault(label, {"stages": []})
+        entry["stages"] = entry["stages"] + records
+    return json.dumps({"meta": meta, "files": files}, indent=2, default=str)
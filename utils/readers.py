@@ -0,0 +1,25 @@
+import os
+
+from utils.workbook import WorkbookReader
+from utils.xlsx_stream import StreamReader
+
+try:
+    from utils.xlsx_calamine import CalamineReader
+except ImportError:  # optional native reader (python-calamine)
+    CalamineReader = None
+
+# Workbook readers with the WorkbookReader interface (sheet_names, columns())
+READERS = {
+    "openpyxl": WorkbookReader,
+    "stream": StreamReader,
+}
+if CalamineReader is not None:
+    READERS["calamine"] = CalamineReader
+DEFAULT_READER = os.environ.get("MF_READER", "openpyxl")
+
+
+def open_workbook(file_bytes, reader=None):
+    name = reader or DEFAULT_READER
+    if name not in READERS:
+        raise ValueError(f"Unknown workbook reader '{name}' (choose from {', '.join(READERS)})")
+    return READERS[name](file_bytes)
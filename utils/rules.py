@@ -0,0 +1,272 @@
+"""Declarative extraction rules and the engine that runs them.
+
+An AMC is described by a spec dict instead of an imperative script::
+
+    SPEC = {
+        "sheet": "MMF23",        # name or index; default first sheet
+        "columns": [1, 6],       # 0-based sheet columns to read (labels, values, ...)
+        "header": 0,             # leading rows to drop
+        "drop_blank_rows": False,
+        "rules": {name: rule},   # evaluated lazily, by name
+        "tags": [(Tag, expr[, when])],
+        "netting": (Tag.NET_EQUITY, Tag.HEDGED_EQUITY[, when]),
+    }
+
+A rule locates rows by ``anchors`` and reads a number relative to each::
+
+    op      "value"  the anchor row's own value
+            "total"  the next total row(s) after it (``kinds``, ``n``, ``skip_invalid``)
+            "block"  the contiguous run of values starting at it
+                     (``stop_label``, ``blank``, ``stop_on_text``)
+    mode    "contains" (default), "prefix" (``strip``) or "exact"
+    pick    "first" (default), "last", "first_ok", "last_ok" (first/last match
+            that yields a number) or "all" (sum over every match)
+    after   keyword whose first match the anchor must come after
+    also    extra substrings the label must contain
+    exclude rows matching these keywords are skipped
+    combine "sum" (default) adds the result of each anchor; "earliest" uses the
+            first row matching any of them
+    label / value   indexes into ``columns`` (default 0 and 1)
+
+Tag expressions add and subtract rule results, optionally through ``abs()``:
+``"abs(treps) - abs(margin)"``. ``when`` emits the tag only if that rule found
+a value, or if the result is ``">0"`` / ``"!=0"``. Tags are canonical
+``utils.allocation.Tag`` members; entries for the same tag add up (e.g.
+separate ReIT and InvIT lines). Netting subtracts the
+absolute hedge from equity and reports the hedge as a positive figure; it is
+skipped if either tag was not emitted or its ``when`` rule found nothing.
+
+All anchor keywords for a label column are compiled into one matcher and
+located in a single scan (``AnchorIndex``). Totals are resolved by binary
+search (``TotalsIndex``), and each value column is parsed to float64 plus a
+validity mask in one vectorized pass (``utils.numbers``), so a spec costs
+one pass over the sheet plus work proportional to the rows it actually reads.
+"""
+import re
+
+import pandas as pd
+from utils.allocation import AllocationResult
+from utils.anchors import AnchorIndex
+from utils.numbers import parse_numbers
+from utils.profiling import stage
+from utils.readers import open_workbook
+from utils.totals import TotalsIndex
+
+TERM = re.compile(r"\s*([+-])?\s*(abs\()?\s*(\w+)\s*\)?")
+
+
+def is_blank(val):
+    return val is None or (isinstance(val, float) and val != val)
+
+
+def parse_expr(expr):
+    terms = []
+    pos = 0
+    while pos < len(expr):
+        m = TERM.match(expr, pos)
+        if not m or m.end() == pos:
+            raise ValueError(f"Bad tag expression: {expr!r}")
+        sign, use_abs, name = m.groups()
+        terms.append((-1.0 if sign == "-" else 1.0, bool(use_abs), name))
+        pos = m.end()
+    return terms
+
+
+class Sheet:
+    """Label indexes, parsed values and totals for the columns of one sheet."""
+
+    def __init__(self, data, keywords):
+        self.data = data
+        self.rows = len(data)
+        self._anchors = {col: AnchorIndex(data[:, col], kws) for col, kws in keywords.items()}
+        self._numbers = {}
+        self._totals = {}
+
+    def anchors(self, col):
+        if col not in self._anchors:
+            self._anchors[col] = AnchorIndex(self.data[:, col])
+        return self._anchors[col]
+
+    def numbers(self, col):
+        """``(values, valid)`` of a column; see ``utils.numbers.parse_numbers``."""
+        if col not in self._numbers:
+            self._numbers[col] = parse_numbers(self.data[:, col])
+        return self._numbers[col]
+
+    def totals(self, label, value):
+        if (label, value) not in self._totals:
+            self._totals[(label, value)] = TotalsIndex(self.anchors(label), self.numbers(value)[0])
+        return self._totals[(label, value)]
+
+
+class Engine:
+    def __init__(self, spec, sheet):
+        self.spec = spec
+        self.sheet = sheet
+        self.results = {}
+
+    def get(self, name):
+        if name not in self.results:
+            self.results[name] = self._evaluate(self.spec["rules"][name])
+        return self.results[name]
+
+    def _candidates(self, rule, anchor):
+        index = self.sheet.anchors(rule.get("label", 0))
+        rows = index.positions(anchor, rule.get("mode", "contains"), rule.get("strip", False))
+        if "after" in rule:
+            start = index.first(rule["after"])
+            if start is None:
+                return []
+            rows = [r for r in rows if r > start]
+        if "also" in rule:
+            rows = [r for r in rows if all(s in index.lower[r] for s in rule["also"])]
+        if "exclude" in rule:
+            skip = {r for kw in rule["exclude"] for r in index.positions(kw)}
+            rows = [r for r in rows if r not in skip]
+        return rows
+
+    def _evaluate(self, rule):
+        anchors = rule["anchors"]
+        if rule.get("combine", "sum") == "earliest":
+            rows = sorted(r for a in anchors for r in self._candidates(rule, a))
+            return self._pick(rule, rows)
+        total, found = 0.0, False
+        for anchor in anchors:
+            value, ok = self._pick(rule, self._candidates(rule, anchor))
+            if ok:
+                total += value
+                found = True
+        return total, found
+
+    def _pick(self, rule, rows):
+        pick = rule.get("pick", "first")
+        if pick == "all":
+            total, found = 0.0, False
+            for r in rows:
+                value, ok = self._at(rule, r)
+                if ok:
+                    total += value
+                    found = True
+            return total, found
+        if pick in ("last", "last_ok"):
+            rows = rows[::-1]
+        if pick in ("first", "last"):
+            rows = rows[:1]
+        for r in rows:
+            value, ok = self._at(rule, r)
+            if ok:
+                return value, True
+        return 0.0, False
+
+    def _at(self, rule, row):
+        label, value = rule.get("label", 0), rule.get("value", 1)
+        nums, valid = self.sheet.numbers(value)
+        op = rule.get("op", "value")
+        if op == "value":
+            return (float(nums[row]), True) if valid[row] else (0.0, False)
+        if op == "total":
+            totals = self.sheet.totals(label, value)
+            rows = totals.rows_after(row, rule.get("kinds", ("total",)), rule.get("n", 1), rule.get("skip_invalid", True))
+            vals = nums[rows[valid[rows]]]
+            return float(vals.sum()), len(vals) > 0
+        if op == "block":
+            return self._block(rule, row, nums, valid)
+        raise ValueError(f"Unknown rule op: {op}")
+
+    def _block(self, rule, row, nums, valid):
+        labels = self.sheet.anchors(rule.get("label", 0)).lower
+        raw = self.sheet.data[:, rule.get("value", 1)]
+        stop_label = rule.get("stop_label")
+        blank_mode = rule.get("blank", "after_start")
+        stop_on_text = rule.get("stop_on_text", False)
+        total, count = 0.0, 0
+        for j in range(row, self.sheet.rows):
+            if stop_label and labels[j] and stop_label in labels[j]:
+                break
+            if is_blank(raw[j]):
+                if (blank_mode == "after_start" and count) or (blank_mode == "after_anchor" and j != row):
+                    break
+                continue
+            if not valid[j]:
+                if stop_on_text and count:
+                    break
+                continue
+            total += float(nums[j])
+            count += 1
+        return total, count > 0
+
+    def _when(self, when, value):
+        if when is None:
+            return True
+        if when == ">0":
+            return value > 0
+        if when == "!=0":
+            return value != 0
+        return self.get(when)[1]
+
+    def tags(self):
+        out = {}
+        for entry in self.spec["tags"]:
+            tag, expr = entry[0], entry[1]
+            value = 0.0
+            for sign, use_abs, name in parse_expr(expr):
+                v = self.get(name)[0]
+                value += sign * (abs(v) if use_abs else v)
+            if self._when(entry[2] if len(entry) > 2 else None, value):
+                out[tag] = out.get(tag, 0.0) + value
+
+        netting = self.spec.get("netting")
+        if netting:
+            equity, hedge = netting[0], netting[1]
+            when = netting[2] if len(netting) > 2 else None
+            if equity in out and hedge in out and self._when(when, None):
+                out[equity] -= abs(out[hedge])
+                out[hedge] = abs(out[hedge])
+        return out
+
+
+def spec_keywords(spec):
+    """Every keyword a spec looks up, grouped by label column."""
+    keywords = {}
+    for rule in spec["rules"].values():
+        kws = keywords.setdefault(rule.get("label", 0), set())
+        if rule.get("mode", "contains") != "exact":
+            kws.update(a.lower() for a in rule["anchors"])
+        for key in ("exclude",):
+            kws.update(k.lower() for k in rule.get(key, ()))
+        if "after" in rule:
+            kws.add(rule["after"].lower())
+    return keywords
+
+
+def read_sheet(spec, file_bytes, reader=None):
+    """The spec's columns of its sheet, as an object array (the parse phase)."""
+    with stage("open"):
+        book = open_workbook(file_bytes, reader)
+    with book:
+        return parse_sheet(spec, book, spec.get("sheet", 0))
+
+
+def parse_sheet(spec, book, sheet):
+    """The spec's columns of ``sheet`` in an open workbook, header and blank rows dropped."""
+    with stage("parse"):
+        data = book.columns(spec["columns"], sheet=sheet)
+        data = data[spec.get("header", 0):]
+        if spec.get("drop_blank_rows"):
+            keep = ~pd.isna(data).all(axis=1)
+            data = data[keep]
+        return data
+
+
+def extract(spec, data):
+    """Evaluate ``spec`` over ``read_sheet`` output; returns an ``AllocationResult``."""
+    with stage("extract"):
+        return AllocationResult.from_tags(Engine(spec, Sheet(data, spec_keywords(spec))).tags())
+
+
+def run_spec(spec, file_bytes, reader=None):
+    """Evaluate ``spec`` against an uploaded workbook; returns an ``AllocationResult``.
+
+    ``reader`` names the workbook reader (see ``utils.readers.READERS``).
+    """
+    return extract(spec, read_sheet(spec, file_bytes, reader))
@@ -0,0 +1,115 @@
+import sys
+import traceback
+from concurrent.futures import as_completed
+
+from utils.allocation import AllocationResult
+from utils.file_router import get_processor
+from utils.profiling import StageTimer, stage
+from utils.schemes import run_schemes
+
+
+def process_file(file_name, file_bytes, processor=None, reader=None):
+    if processor is None:
+        with stage("routing"):
+            processor = get_processor(file_name, file_bytes)
+    result = processor(file_bytes, reader=reader)
+    if not isinstance(result, AllocationResult):
+        raise TypeError("Processor did not return an AllocationResult")
+    return result
+
+
+def process_schemes(file_name, file_bytes, processor=None, reader=None, executor=None, trace_memory=False):
+    """Every scheme sheet of a multi-scheme workbook, one row per scheme (see ``utils.schemes``)."""
+    if processor is None:
+        with stage("routing"):
+            processor = get_processor(file_name, file_bytes)
+    spec = sys.modules[processor.__module__].SPEC
+    return run_schemes(spec, file_bytes, reader, executor, trace_memory=trace_memory)
+
+
+def format_error(e):
+    return "\n".join(traceback.format_exception_only(type(e), e)).strip()
+
+
+def profile_file(file_name, file_bytes, processor=None, reader=None, trace_memory=False, schemes=False, executor=None):
+    """``process_file`` (or ``process_schemes``) under a ``StageTimer``.
+
+    Returns ``(df, error, stages)`` and never raises.
+    """
+    timer = StageTimer(trace_memory)
+    with timer.active():
+        try:
+            if schemes:
+                df = process_schemes(file_name, file_bytes, processor, reader, executor, trace_memory)
+            else:
+                df = process_file(file_name, file_bytes, processor, reader)
+        except Exception as e:
+            return None, format_error(e), timer.records
+    return df, None, timer.records
+
+
+def iter_results(files, executor=None, cache=None, reader=None, trace_memory=False, schemes=False):
+    """Yield ``(file_name, df, error, stages)`` for each ``(file_name, file_bytes)`` as it finishes.
+
+    Without an executor files run one after another in this process. With one
+    (e.g. a ``ProcessPoolExecutor``) they are all submitted up front and
+    yielded in completion order. Exactly one of ``df`` / ``error`` is set.
+    With a ``ResultCache``, cached results are yielded first and only misses
+    are processed; successful results are stored back. ``reader`` picks the
+    workbook reader (``utils.readers.READERS``); results don't depend on it.
+    ``stages`` are the ``StageTimer`` records of the file's run.
+
+    With ``schemes`` every sheet of each workbook is extracted
+    (``process_schemes``); files then run one after another and the
+    executor is spread over the sheets of each instead.
+    """
+    todo = []
+    keys = {}
+    for file_name, file_bytes in files:
+        processor = df = None
+        timer = StageTimer(trace_memory)
+        if cache is not None:
+            with timer.active():
+                try:
+                    with stage("routing"):
+                        processor = get_processor(file_name, file_bytes)
+                    with stage("cache"):
+                        keys[file_name] = cache.key(file_bytes, processor, "schemes" if schemes else "")
+                        df = cache.get(keys[file_name])
+                except ValueError:
+                    timer.records.clear()  # unroutable; process_file reports it
+                except Exception as e:  # e.g. a broken plugin module or an unreadable cache
+                    yield file_name, None, format_error(e), timer.records
+                    continue
+            if df is not None:
+                yield file_name, df, None, timer.records
+                continue
+        todo.append((file_name, file_bytes, processor, timer.records))
+
+    for file_name, df, err, stages in _run(todo, executor, reader, trace_memory, schemes):
+        if err is None and file_name in keys:
+            try:
+                cache.put(keys[file_name], df)
+            except OSError:
+                pass  # the result stands; it just won't be reused
+        yield file_name, df, err, stages
+
+
+def _run(files, executor, reader=None, trace_memory=False, schemes=False):
+    if executor is None or schemes:
+        for file_name, file_bytes, processor, before in files:
+            df, err, stages = profile_file(file_name, file_bytes, processor, reader, trace_memory, schemes, executor)
+            yield file_name, df, err, before + stages
+        return
+
+    futures = {
+        executor.submit(profile_file, name, data, proc, reader, trace_memory): (name, before)
+        for name, data, proc, before in files
+    }
+    for future in as_completed(futures):
+        file_name, before = futures[future]
+        try:
+            df, err, stages = future.result()
+        except Exception as e:  # the worker itself failed, e.g. a broken pool
+            df, err, stages = None, format_error(e), []
+        yield file_name, df, err, before + stages
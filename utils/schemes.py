@@ -0,0 +1,104 @@
+"""Every scheme sheet of a multi-scheme AMC workbook in one pass.
+
+AMC monthly disclosures carry one sheet per scheme in the layout a
+processor's ``SPEC`` describes for its single sheet. ``run_schemes`` opens
+the workbook once, evaluates the spec on each sheet and returns one row per
+sheet: the scheme (sheet name), a column per canonical tag and an ``Issue`` that
+explains sheets that were skipped (cover pages, index sheets, odd layouts).
+
+With an executor the sheets are dealt round-robin into ``tasks`` chunks,
+and each worker opens the workbook once for its whole chunk.
+"""
+import os
+from concurrent.futures import as_completed
+
+import numpy as np
+import pandas as pd
+from utils.allocation import LABELS, AllocationResult
+from utils.fingerprint import sheet_names
+from utils.profiling import StageTimer, add_records, stage
+from utils.readers import open_workbook
+from utils.rules import Engine, Sheet, parse_sheet, spec_keywords
+
+SCHEME_COLUMN = "Scheme"
+ISSUE_COLUMN = "Issue"
+NO_ALLOCATIONS = "no allocation rows found"
+
+
+def evaluate_sheet(spec, data):
+    """``AllocationResult`` of one sheet, or ``None`` if none of the spec's rules matched."""
+    with stage("extract"):
+        engine = Engine(spec, Sheet(data, spec_keywords(spec)))
+        if not any(engine.get(name)[1] for name in spec["rules"]):
+            return None
+        return AllocationResult.from_tags(engine.tags())
+
+
+def extract_sheets(spec, file_bytes, sheets=None, reader=None):
+    """``({sheet: AllocationResult}, {sheet: issue})`` for ``sheets`` (default: all) of one open workbook."""
+    results, issues = {}, {}
+    with stage("open"):
+        book = open_workbook(file_bytes, reader)
+    with book:
+        for sheet in book.sheet_names if sheets is None else sheets:
+            try:
+                result = evaluate_sheet(spec, parse_sheet(spec, book, sheet))
+            except (IndexError, ValueError, TypeError) as e:  # one odd sheet shouldn't sink the workbook
+                issues[sheet] = f"{type(e).__name__}: {e}"
+                continue
+            if result is None:
+                issues[sheet] = NO_ALLOCATIONS
+            else:
+                results[sheet] = result
+    return results, issues
+
+
+def profile_sheets(spec, file_bytes, sheets, reader=None, trace_memory=False):
+    """``extract_sheets`` in a worker, returning its stage records as well."""
+    timer = StageTimer(trace_memory)
+    with timer.active():
+        results, issues = extract_sheets(spec, file_bytes, sheets, reader)
+    return results, issues, timer.records
+
+
+def scheme_table(order, results, issues):
+    empty = AllocationResult()
+    values = np.vstack([results.get(sheet, empty).values for sheet in order]) if order else np.empty((0, len(LABELS)))
+    table = pd.DataFrame(values, columns=LABELS)
+    table.insert(0, SCHEME_COLUMN, list(order))
+    table[ISSUE_COLUMN] = [issues.get(sheet) for sheet in order]
+    return table
+
+
+def scheme_rows(table):
+    """``(scheme, tag, value)`` for every extracted value of a ``run_schemes`` table."""
+    rows = []
+    for record in table[table[ISSUE_COLUMN].isna()].drop(columns=ISSUE_COLUMN).to_dict("records"):
+        scheme = record.pop(SCHEME_COLUMN)
+        rows.extend((scheme, tag, value) for tag, value in record.items() if pd.notna(value))
+    return rows
+
+
+def fund_sheet(spec, file_bytes):
+    """Name of the sheet a spec reads when run on a single sheet."""
+    sheet = spec.get("sheet", 0)
+    return sheet if isinstance(sheet, str) else sheet_names(file_bytes)[sheet]
+
+
+def run_schemes(spec, file_bytes, reader=None, executor=None, tasks=None, trace_memory=False):
+    """Scheme-indexed allocations of every sheet of the workbook (see module docstring)."""
+    names = sheet_names(file_bytes)
+    if executor is None:
+        results, issues = extract_sheets(spec, file_bytes, names, reader)
+        return scheme_table(names, results, issues)
+
+    tasks = max(1, min(tasks or os.cpu_count() or 1, len(names)))
+    chunks = [names[i::tasks] for i in range(tasks)]
+    futures = [executor.submit(profile_sheets, spec, file_bytes, chunk, reader, trace_memory) for chunk in chunks]
+    results, issues = {}, {}
+    for future in as_completed(futures):
+        part, part_issues, records = future.result()
+        results.update(part)
+        issues.update(part_issues)
+        add_records(records)
+    return scheme_table(names, results, issues)
@@ -0,0 +1,25 @@
+"""The canonical allocation tags, importable without numpy or pandas."""
+from enum import IntEnum
+
+
+class Tag(IntEnum):
+    NET_EQUITY = 0
+    HEDGED_EQUITY = 1
+    INTERNATIONAL_EQUITY = 2
+    DEBT = 3
+    GOLD = 4
+    SILVER = 5
+    COMMODITY_DERIVATIVES = 6
+    REIT_INVIT = 7
+    CASH = 8
+
+    @property
+    def label(self):
+        return LABELS[self]
+
+
+LABELS = [
+    "Net Equity", "Hedged Equity", "International Equity", "Debt", "Gold", "Silver",
+    "Commodity Derivatives", "ReIT/InvIT", "Cash & Others",
+]
+TAGS = list(Tag)
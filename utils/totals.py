@@ -0,0 +1,37 @@
+import numpy as np
+
+
+class TotalsIndex:
+    """Sorted positions of a sheet's "total" / "sub total" rows.
+
+    Built on top of an ``AnchorIndex`` for the label column; ``values`` is the
+    parsed column the totals are read from (float64, NaN where invalid). Lookups of the form
+    "n-th total after row i" are answered with ``np.searchsorted`` instead of walking the sheet.
+    """
+
+    def __init__(self, anchors, values):
+        self.anchors = anchors
+        self.values = np.asarray(values, dtype=np.float64)
+        self._cache = {}
+
+    def _rows(self, kinds, skip_invalid):
+        key = (kinds, skip_invalid)
+        if key not in self._cache:
+            pos = sorted(p for kind in set(kinds) for p in self.anchors.positions(kind, mode="exact"))
+            pos = np.asarray(pos, dtype=np.intp)
+            if skip_invalid:
+                pos = pos[~np.isnan(self.values[pos])]
+            self._cache[key] = pos
+        return self._cache[key]
+
+    def rows_after(self, start, kinds=("total",), n=1, skip_invalid=True):
+        """Positions of the first ``n`` total rows strictly after ``start``.
+
+        With ``skip_invalid`` rows whose value is blank or non-numeric are
+        passed over; otherwise they count towards ``n``.
+        """
+        if start is None:
+            return np.empty(0, dtype=np.intp)
+        pos = self._rows(tuple(kinds), skip_invalid)
+        k = np.searchsorted(pos, start, side="right")
+        return pos[k:k + n]
@@ -0,0 +1,160 @@
+"""Per-session upload storage with a memory budget and spill to disk.
+
+Session state keeps only ``Upload`` handles (name, SHA-256, size and either
+the bytes or a file path). Each session keeps uploads in memory up to
+``budget`` bytes and writes the rest to ``<root>/<session id>/``. The same
+content under several names is held once. Bytes are read back only while a
+file is processed. A sweeper deletes the spill
+directories of sessions not seen for ``ttl`` seconds.
+"""
+import hashlib
+import mmap
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+DEFAULT_ROOT = os.environ.get("MF_SPILL_DIR", os.path.join(tempfile.gettempdir(), "mutualfund-uploads"))
+DEFAULT_BUDGET = int(float(os.environ.get("MF_SESSION_MEMORY_MB", "64")) * 2**20)
+SESSION_TTL = float(os.environ.get("MF_SESSION_TTL_HOURS", "6")) * 3600
+SWEEP_INTERVAL = 600
+TOUCH_FILE = ".touched"
+
+
+class Upload:
+    """One uploaded file, held in memory or spilled to ``path``."""
+
+    def __init__(self, name, digest, size, data=None, path=None):
+        self.name = name
+        self.digest = digest
+        self.size = size
+        self._data = data
+        self.path = path
+
+    @property
+    def spilled(self):
+        return self._data is None
+
+    def read(self):
+        """The file's bytes; spilled files are mapped and copied out in one go."""
+        if self._data is not None:
+            return self._data
+        if self.size == 0:
+            return b""
+        with open(self.path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return mm[:]
+
+
+class UploadStore:
+    """The uploads of one session, by file name (see module docstring)."""
+
+    def __init__(self, session_id, root=DEFAULT_ROOT, budget=DEFAULT_BUDGET):
+        self.dir = os.path.join(root, session_id)
+        self.budget = budget
+        self.uploads = {}
+
+    def __len__(self):
+        return len(self.uploads)
+
+    def __contains__(self, name):
+        return name in self.uploads
+
+    def items(self):
+        return self.uploads.items()
+
+    @property
+    def memory_bytes(self):
+        return sum({u.digest: u.size for u in self.uploads.values() if not u.spilled}.values())
+
+    @property
+    def disk_bytes(self):
+        return sum({u.digest: u.size for u in self.uploads.values() if u.spilled}.values())
+
+    def twin(self, digest):
+        """An upload already holding this content (under any name), or ``None``."""
+        return next((u for u in self.uploads.values() if u.digest == digest), None)
+
+    def add(self, name, data):
+        """Store ``data`` as ``name`` (replacing any earlier upload of that name)."""
+        digest = hashlib.sha256(data).hexdigest()
+        old = self.uploads.pop(name, None)
+        if old is not None and old.digest == digest:
+            self.uploads[name] = old
+            return old
+        twin = self.twin(digest)
+        if twin is not None:
+            upload = Upload(name, digest, twin.size, data=twin._data, path=twin.path)
+        elif self.memory_bytes + len(data) <= self.budget:
+            upload = Upload(name, digest, len(data), data=data)
+        else:
+            os.makedirs(self.dir, exist_ok=True)
+            path = os.path.join(self.dir, digest + ".xlsx")
+            if not os.path.exists(path):
+                fd, tmp = tempfile.mkstemp(dir=self.dir, suffix=".tmp")
+                with os.fdopen(fd, "wb") as fh:
+                    fh.write(data)
+                os.replace(tmp, path)
+            upload = Upload(name, digest, len(data), path=path)
+        self.uploads[name] = upload
+        if old is not None:
+            self._release(old)
+        return upload
+
+    def _release(self, upload):
+        # Another name may hold the same spilled content
+        if upload.spilled and not any(u.path == upload.path for u in self.uploads.values()):
+            try:
+                os.remove(upload.path)
+            except OSError:
+                pass
+
+    def prune(self):
+        """Forget spilled uploads whose file is gone (e.g. swept while idle); returns their names."""
+        gone = [name for name, u in self.uploads.items() if u.spilled and not os.path.exists(u.path)]
+        for name in gone:
+            del self.uploads[name]
+        return gone
+
+    def touch(self):
+        """Mark the session alive so the sweeper leaves its files alone."""
+        if os.path.isdir(self.dir):
+            with open(os.path.join(self.dir, TOUCH_FILE), "w"):
+                pass
+
+    def clear(self):
+        self.uploads = {}
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+
+def sweep(root=DEFAULT_ROOT, ttl=SESSION_TTL):
+    """Delete session spill directories untouched for ``ttl`` seconds; returns how many."""
+    if not os.path.isdir(root):
+        return 0
+    cutoff = time.time() - ttl
+    removed = 0
+    for entry in os.listdir(root):
+        path = os.path.join(root, entry)
+        if not os.path.isdir(path):
+            continue
+        marker = os.path.join(path, TOUCH_FILE)
+        try:
+            seen = os.path.getmtime(marker if os.path.exists(marker) else path)
+        except OSError:
+            continue
+        if seen < cutoff:
+            shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+    return removed
+
+
+def start_sweeper(root=DEFAULT_ROOT, ttl=SESSION_TTL, interval=SWEEP_INTERVAL):
+    """Run ``sweep`` every ``interval`` seconds in a daemon thread; returns the thread."""
+    def loop():
+        while True:
+            sweep(root, ttl)
+            time.sleep(interval)
+
+    thread = threading.Thread(target=loop, name="mf-upload-sweeper", daemon=True)
+    thread.start()
+    return thread
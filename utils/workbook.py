@@ -0,0 +1,81 @@
+from io import BytesIO
+
+import numpy as np
+from openpyxl import load_workbook
+
+# Strings pandas.read_excel turns into NaN by default, plus Excel error values
+NA_STRINGS = {
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+    "#NULL!", "#DIV/0!", "#VALUE!", "#REF!", "#NAME?", "#NUM!",
+}
+
+
+class WorkbookReader:
+    """Opens an uploaded workbook once and streams selected columns of a sheet.
+
+    The workbook is loaded read-only with cached values only, so sheets are
+    parsed row by row on demand and nothing but the requested columns is
+    kept. Cells come back the way ``pd.read_excel(header=None)`` would hand
+    them to a processor: blank and NA-like cells are NaN, rows keep their
+    sheet positions and trailing empty rows are dropped.
+    """
+
+    def __init__(self, file_bytes):
+        self.book = load_workbook(BytesIO(file_bytes), read_only=True, data_only=True, keep_links=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.book.close()
+
+    @property
+    def sheet_names(self):
+        return [ws.title for ws in self.book.worksheets]
+
+    def sheet(self, sheet=0):
+        if isinstance(sheet, int):
+            return self.book.worksheets[sheet]
+        if sheet not in self.sheet_names:
+            raise ValueError(f"Worksheet named '{sheet}' not found")
+        return self.book[sheet]
+
+    def columns(self, cols, sheet=0):
+        """Object array of shape (rows, len(cols)) holding only the given 0-based columns."""
+        ws = self.sheet(sheet)
+        ws.reset_dimensions()
+        out = []
+        width = 0
+        last_row_with_data = -1
+        for idx, row in enumerate(ws.iter_rows(values_only=True)):
+            n = len(row)
+            if n > width:
+                while n > width and row[n - 1] in (None, ""):
+                    n -= 1
+                width = n
+            if row.count(None) < len(row):
+                last_row_with_data = idx
+            out.append(tuple(row[c] if c < len(row) else None for c in cols))
+        return to_array(out, cols, width, last_row_with_data, ws.title)
+
+
+def to_array(rows, cols, width, last_row, title):
+    """Shape streamed rows like ``pd.read_excel(header=None)`` would.
+
+    ``rows`` holds the requested cells of every sheet row; rows after
+    ``last_row`` (the last one with any value) are dropped, ``width`` is the
+    sheet's used width and blank / NA-like cells become NaN.
+    """
+    del rows[last_row + 1:]
+    if max(cols) >= width:
+        raise IndexError(f"Sheet '{title}' has {width} columns; column {max(cols) + 1} requested")
+
+    data = np.empty((len(rows), len(cols)), dtype=object)
+    data[:] = rows
+    blank = np.frompyfunc(lambda v: v is None or (isinstance(v, str) and v in NA_STRINGS), 1, 1)(data).astype(bool)
+    data[blank] = np.nan
+    return data
@@ -0,0 +1,63 @@
+from datetime import date, datetime
+from io import BytesIO
+
+from python_calamine import CalamineWorkbook, WorksheetNotFound
+from utils.workbook import to_array
+
+
+def _value(v):
+    # calamine reads every number as a float, midnight dates as dates and
+    # blanks / error cells as ""; hand them over the way openpyxl would
+    if type(v) is float:
+        return int(v) if v.is_integer() else v
+    if v == "":
+        return None
+    if type(v) is date:
+        return datetime(v.year, v.month, v.day)
+    return v
+
+
+class CalamineReader:
+    """``WorkbookReader`` on top of calamine (Rust), via ``python-calamine``.
+
+    The sheet is decoded natively in one call and only the requested columns
+    are converted to Python values, cast to what openpyxl would return.
+    """
+
+    def __init__(self, file_bytes):
+        self.book = CalamineWorkbook.from_filelike(BytesIO(file_bytes))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.book.close()
+
+    @property
+    def sheet_names(self):
+        return self.book.sheet_names
+
+    def sheet(self, sheet=0):
+        if isinstance(sheet, int):
+            return self.book.get_sheet_by_index(sheet)
+        try:
+            return self.book.get_sheet_by_name(sheet)
+        except WorksheetNotFound:
+            raise ValueError(f"Worksheet named '{sheet}' not found") from None
+
+    def columns(self, cols, sheet=0):
+        """Object array of shape (rows, len(cols)) holding only the given 0-based columns."""
+        ws = self.sheet(sheet)
+        if not ws.height:
+            return to_array([], cols, 0, -1, ws.name)
+        # Rows start at A1 but each one starts at the first used column
+        first = ws.start[1]
+        picks = [c - first for c in cols]
+        out = []
+        for row in ws.iter_rows():
+            n = len(row)
+            out.append(tuple(_value(row[p]) if 0 <= p < n else None for p in picks))
+        return to_array(out, cols, ws.end[1] + 1, len(out) - 1, ws.name)
@@ -0,0 +1,274 @@
+import posixpath
+import zipfile
+from datetime import datetime
+from functools import lru_cache
+from io import BytesIO
+from xml.etree.ElementTree import iterparse
+from xml.parsers.expat import ParserCreate
+
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format
+from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900, from_excel
+from utils.workbook import to_array
+
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+DIGITS = "0123456789"
+
+
+@lru_cache(maxsize=None)
+def column_letters_index(letters):
+    idx = 0
+    for ch in letters:
+        idx = idx * 26 + ord(ch) - 64
+    return idx - 1
+
+
+def column_index(ref):
+    """0-based column of a cell reference such as ``"AB12"``."""
+    return column_letters_index(ref.rstrip(DIGITS))
+
+
+def _ns(tag):
+    return tag[:tag.index("}") + 1] if tag.startswith("{") else ""
+
+
+def _cast_number(text):
+    # Same rule as openpyxl: integers stay int
+    if "." in text or "E" in text or "e" in text:
+        return float(text)
+    return int(text)
+
+
+class _SharedStrings:
+    """Shared string table parsed only as far as the highest index asked for."""
+
+    def __init__(self, zf):
+        self._strings = []
+        self._events = None
+        if "xl/sharedStrings.xml" in zf.namelist():
+            self._events = iterparse(zf.open("xl/sharedStrings.xml"), events=("start", "end"))
+            self._root = None
+
+    def __getitem__(self, idx):
+        while idx >= len(self._strings) and self._events is not None:
+            self._advance()
+        return self._strings[idx]
+
+    def _advance(self):
+        for event, el in self._events:
+            if self._root is None:
+                self._root = el
+                ns = _ns(el.tag)
+                self._si, self._t, self._rph = ns + "si", ns + "t", ns + "rPh"
+                continue
+            if event == "end" and el.tag == self._si:
+                parts = []
+                for child in el:
+                    if child.tag == self._t:
+                        parts.append(child.text or "")
+                    elif child.tag != self._rph:  # rich-text run; skip phonetic hints
+                        parts.extend(t.text or "" for t in child.iter(self._t))
+                self._strings.append("".join(parts))
+                self._root.clear()
+                return
+        self._events = None
+
+
+class StreamReader:
+    """Minimal .xlsx reader that streams one sheet's XML straight from the zip.
+
+    A drop-in for ``WorkbookReader``: the target sheet is located through
+    ``xl/workbook.xml`` and its relationships (read with ``iterparse``), its
+    XML is fed to an expat parser whose callbacks keep only the requested
+    columns, and shared strings are decoded lazily. Other sheets are never decompressed and no cell objects
+    are built. Values are converted the way openpyxl does (ints, floats,
+    booleans, dates for date-formatted numbers, cached formula results).
+    """
+
+    def __init__(self, file_bytes):
+        self.zf = zipfile.ZipFile(BytesIO(file_bytes))
+        self._sheets = self._read_sheets()
+        self._strings = None
+        self._date_styles = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.zf.close()
+
+    def _read_sheets(self):
+        targets = {}
+        with self.zf.open("xl/_rels/workbook.xml.rels") as fh:
+            for _, el in iterparse(fh):
+                if el.tag.endswith("Relationship"):
+                    target = el.get("Target")
+                    if target.startswith("/"):
+                        targets[el.get("Id")] = target.lstrip("/")
+                    else:
+                        targets[el.get("Id")] = posixpath.normpath(posixpath.join("xl", target))
+        sheets = []
+        self.epoch = CALENDAR_WINDOWS_1900
+        with self.zf.open("xl/workbook.xml") as fh:
+            for _, el in iterparse(fh):
+                if el.tag.endswith("}sheet"):
+                    sheets.append((el.get("name"), targets[el.get(REL_NS + "id")]))
+                elif el.tag.endswith("}workbookPr") and el.get("date1904") in ("1", "true"):
+                    self.epoch = CALENDAR_MAC_1904
+        return sheets
+
+    @property
+    def sheet_names(self):
+        return [name for name, _ in self._sheets]
+
+    def _part(self, sheet):
+        if isinstance(sheet, int):
+            return self._sheets[sheet]
+        for name, part in self._sheets:
+            if name == sheet:
+                return name, part
+        raise ValueError(f"Worksheet named '{sheet}' not found")
+
+    def _load_date_styles(self):
+        """Set of cell style indexes whose number format is a date."""
+        styles = set()
+        if "xl/styles.xml" not in self.zf.namelist():
+            return styles
+        custom = {}
+        xf_formats = []
+        in_cell_xfs = False
+        with self.zf.open("xl/styles.xml") as fh:
+            for event, el in iterparse(fh, events=("start", "end")):
+                tag = el.tag.rsplit("}", 1)[-1]
+                if tag == "numFmt" and event == "end":
+                    custom[int(el.get("numFmtId"))] = el.get("formatCode")
+                elif tag == "cellXfs":
+                    in_cell_xfs = event == "start"
+                elif tag == "xf" and event == "start" and in_cell_xfs:
+                    xf_formats.append(int(el.get("numFmtId", 0)))
+        for idx, fmt_id in enumerate(xf_formats):
+            fmt = custom.get(fmt_id, BUILTIN_FORMATS.get(fmt_id))
+            if fmt and is_date_format(fmt):
+                styles.add(idx)
+        return styles
+
+    def _value(self, cell, kind, text):
+        if kind == "s":
+            if self._strings is None:
+                self._strings = _SharedStrings(self.zf)
+            return self._strings[int(text)]
+        if kind == "b":
+            return bool(int(text))
+        if kind in ("str", "e"):
+            return text
+        if kind == "d":
+            return datetime.fromisoformat(text)
+        value = _cast_number(text)
+        style = cell.get("s")
+        if style is not None:
+            if self._date_styles is None:
+                self._date_styles = self._load_date_styles()
+            if int(style) in self._date_styles:
+                return from_excel(value, self.epoch)
+        return value
+
+    def columns(self, cols, sheet=0):
+        """Object array of shape (rows, len(cols)) holding only the given 0-based columns."""
+        title, part = self._part(sheet)
+        handler = _SheetHandler(self, cols)
+        parser = ParserCreate()
+        parser.buffer_text = True
+        parser.StartElementHandler = handler.start
+        parser.EndElementHandler = handler.end
+        parser.CharacterDataHandler = handler.data
+        with self.zf.open(part) as fh:
+            parser.ParseFile(fh)
+        return to_array(handler.out, cols, handler.width, handler.last_row, title)
+
+
+class _SheetHandler:
+    """expat callbacks collecting the wanted columns of a worksheet.
+
+    Elements are matched by qualified name, with the prefix (if any) taken
+    from the root element, and no tree is built.
+    """
+
+    def __init__(self, reader, cols):
+        self.reader = reader
+        self.wanted = {c: k for k, c in enumerate(cols)}
+        self.ncols = len(cols)
+        self.out = []
+        self.width = 0
+        self.last_row = -1
+        self.names = None
+        self.values = None
+        self.row_idx = -1
+        self.pos = -1
+        self.cell = None
+        self.text = None
+        self.buf = None
+        self.in_is = self.in_rph = False
+
+    def start(self, name, attrs):
+        names = self.names
+        if names is None:
+            prefix = name[:name.index(":") + 1] if ":" in name else ""
+            self.names = {prefix + t: t for t in ("row", "c", "v", "is", "t", "rPh")}
+            return
+        tag = names.get(name)
+        if tag == "c":
+            ref = attrs.get("r")
+            self.pos = column_index(ref) if ref else self.pos + 1
+            self.cell = attrs
+            self.text = None
+        elif tag == "v" or (tag == "t" and self.in_is and not self.in_rph):
+            self.buf = []
+        elif tag == "is":
+            self.in_is = True
+            self.text = ""
+        elif tag == "rPh":
+            self.in_rph = True
+        elif tag == "row":
+            r = attrs.get("r")
+            self.row_idx = int(r) - 1 if r else self.row_idx + 1
+            out = self.out
+            while len(out) <= self.row_idx:
+                out.append([None] * self.ncols)
+            self.values = out[self.row_idx]
+            self.pos = -1
+
+    def data(self, text):
+        if self.buf is not None:
+            self.buf.append(text)
+
+    def end(self, name):
+        tag = self.names.get(name)
+        if tag == "v":
+            self.text = "".join(self.buf)
+            self.buf = None
+        elif tag == "t" and self.buf is not None:
+            self.text += "".join(self.buf)
+            self.buf = None
+        elif tag == "is":
+            self.in_is = False
+        elif tag == "rPh":
+            self.in_rph = False
+        elif tag == "c":
+            self._cell()
+
+    def _cell(self):
+        text, attrs, pos = self.text, self.cell, self.pos
+        kind = attrs.get("t", "n")
+        if kind == "inlineStr":
+            kind = "str"
+        if text is None or (text == "" and kind == "n"):
+            return
+        self.last_row = self.row_idx
+        if pos in self.wanted or pos >= self.width:
+            value = self.reader._value(attrs, kind, text)
+            if pos in self.wanted:
+                self.values[self.wanted[pos]] = value
+            if pos >= self.width and value != "":
+                self.width = pos + 1